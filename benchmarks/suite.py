@@ -0,0 +1,244 @@
+"""
+Benchmark suite of parse hot paths with regression check.
+
+Cases:
+    radario_parse_N        - Radario.parse of tests/test_data/test_radario/N.html
+                             (EventPage from ready soup + tags of page nodes)
+    timepad_parse_N        - Timepad.parse of synthetic events.json
+                             with N events (all tags)
+    remove_html_tags, strip_html_tags, add_emoji,
+    prepare_post_text, parse_date_ranges - helpers in isolation
+
+Times are compared with baseline relative to calibration loop
+(pure python workload), so baseline from another machine is usable.
+
+Run from repository root:
+    python benchmarks/suite.py                 # compare with baseline
+    python benchmarks/suite.py --save          # save new baseline
+    python benchmarks/suite.py -k timepad      # only matching cases
+
+The same regression check is opt-in test of pytest run (e.g. in CI):
+    ESCRAPER_BENCHMARK=1 pytest tests/test_benchmarks.py
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import timeit
+from datetime import datetime
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("TIMEPAD_TOKEN", "benchmark")
+
+from escraper.emoji import add_emoji  # noqa: E402
+from escraper.parsers import Radario, Timepad  # noqa: E402
+from escraper.parsers.metro import SubwayCache  # noqa: E402
+from escraper.parsers.radario import (  # noqa: E402
+    TAG_NODES,
+    EventPage,
+    parse_date_ranges,
+)
+from escraper.parsers.utils import ALL_EVENT_TAGS, strip_html_tags  # noqa: E402
+
+
+BASELINE = Path(__file__).parent / "baseline.json"
+THRESHOLD = 0.5  # allowed slowdown relative to baseline (timings are noisy)
+RADARIO_TESTDATA = ROOT / "tests" / "test_data" / "test_radario"
+TIMEPAD_SIZES = (10, 100, 10_000)
+
+DESCRIPTION = (
+    "<p>Описание <b>события</b> с&nbsp;разметкой. Второе предложение!<br/>"
+    "Третье предложение &amp; ссылка <a href=\"https://timepad.ru\">тут</a>.</p>"
+) * 20
+TITLES = [
+    "Концерт у Финского залива",
+    "Лекция о космосе и музыке",
+    "Мастер-класс по керамике",
+    "Вечер поэзии &laquo;Серебряный век&raquo;",
+]
+DATE_STRINGS = [
+    "01 января, 19:00",
+    "15 марта, 10:00-18:00",
+    "01-03 апреля",
+    "30 декабря - 02 января",
+]
+
+
+def calibration():
+    """
+    Pure python workload, that doesn't depend on escraper code.
+    """
+    return sorted(str(i * 7919 % 1009) for i in range(1000))
+
+
+def timepad_event(i, rng):
+    return dict(
+        id=i,
+        name=rng.choice(TITLES),
+        created_at="2021-01-01T00:00:00+0300",
+        starts_at="2021-01-02T19:00:00+0300",
+        ends_at="2021-01-02T21:00:00+0300",
+        location=dict(city="Санкт-Петербург", address=f"Невский пр., {i % 100}"),
+        categories=[dict(name="Концерты")],
+        organization=dict(name="Филармония &laquo;Тест&raquo;"),
+        description_html=DESCRIPTION,
+        poster_image=dict(uploadcare_url="//ucare.timepad.ru/test/"),
+        registration_data=dict(is_registration_open=True, price_min=0, price_max=500),
+        ticket_types=[dict(price=500, status="ok"), dict(price=300, status="ok")],
+        url=f"https://test.timepad.ru/event/{i}/",
+        moderation_status="moderated",
+    )
+
+
+def radario_cases():
+    radario = Radario(emoji_seed=0)
+
+    for path in sorted(RADARIO_TESTDATA.glob("[0-9].html")):
+        soup = BeautifulSoup(path.read_text(encoding="utf-8"), radario.html_parser)
+
+        # test pages besides 1.html have only nodes of some tags
+        nodes = EventPage(soup).nodes
+        tags = [tag for tag in ALL_EVENT_TAGS if nodes[TAG_NODES[tag][0]] is not None]
+
+        def case(soup=soup, tags=tags):
+            return radario.parse(EventPage(soup), tags=tags)
+
+        yield f"radario_parse_{path.stem}", case
+
+
+def timepad_cases():
+    # metro lookup is not benchmarked (find_metro index)
+    timepad = Timepad(subway_cache=SubwayCache(lambda address: None), emoji_seed=0)
+    rng = random.Random(0)
+
+    for size in TIMEPAD_SIZES:
+        values = json.loads(json.dumps([timepad_event(i, rng) for i in range(size)]))
+
+        def case(values=values):
+            return list(timepad._parse_values(values, tags=ALL_EVENT_TAGS))
+
+        yield f"timepad_parse_{size}", case
+
+
+def helper_cases():
+    radario = Radario()
+    rng = random.Random(0)
+    reference = Radario.TIMEZONE.localize(datetime(2021, 1, 1, 12))
+    post_text = strip_html_tags(DESCRIPTION)
+
+    yield "remove_html_tags", lambda: radario.remove_html_tags(DESCRIPTION)
+    yield "strip_html_tags", lambda: strip_html_tags(DESCRIPTION)
+    yield "add_emoji", lambda: [add_emoji(title, rng=rng) for title in TITLES]
+    yield "prepare_post_text", lambda: radario.prepare_post_text(post_text)
+    yield "parse_date_ranges", lambda: parse_date_ranges(
+        DATE_STRINGS, reference, Radario.TIMEZONE
+    )
+
+
+def all_cases():
+    yield from radario_cases()
+    yield from timepad_cases()
+    yield from helper_cases()
+
+
+def measure(function, repeat=7):
+    """
+    Best time of one call in seconds.
+    """
+    number, _ = timeit.Timer(function).autorange()
+
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number
+
+
+def run(pattern=None):
+    """
+    {case: {"us": time of call, "relative": time / calibration time}}
+    """
+    results = dict()
+
+    for name, function in all_cases():
+        if pattern and pattern not in name:
+            continue
+
+        # calibration right before case: machine load changes during run
+        calibration_time = measure(calibration)
+        seconds = measure(function)
+        results[name] = dict(
+            us=round(seconds * 1e6, 3),
+            relative=round(seconds / calibration_time, 4),
+        )
+
+    return results
+
+
+def compare(results, baseline, threshold=THRESHOLD):
+    """
+    Print results table, return names of regressed cases.
+    """
+    regressed = list()
+    print(f"{'case':<24} {'time, us':>12} {'baseline, us':>14} {'change':>8}")
+
+    for name, result in results.items():
+        base = baseline.get(name)
+
+        if base is None:
+            print(f"{name:<24} {result['us']:>12.1f} {'-':>14} {'new':>8}")
+            continue
+
+        change = result["relative"] / base["relative"] - 1
+        mark = ""
+        if change > threshold:
+            regressed.append(name)
+            mark = "  REGRESSION"
+
+        print(
+            f"{name:<24} {result['us']:>12.1f} {base['us']:>14.1f} "
+            f"{change:>+8.0%}{mark}"
+        )
+
+    return regressed
+
+
+def load_baseline(path=BASELINE):
+    if not path.exists():
+        return dict()
+
+    return json.loads(path.read_text())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--save", action="store_true", help="Save results as baseline")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    parser.add_argument("-k", dest="pattern", default=None, help="Run matching cases")
+    args = parser.parse_args(argv)
+
+    results = run(args.pattern)
+    baseline = load_baseline(args.baseline)
+
+    regressed = compare(results, baseline, args.threshold)
+
+    if args.save:
+        baseline.update(results)
+        args.baseline.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if regressed:
+        print(
+            f"Regressed more than {args.threshold:.0%}: {', '.join(regressed)}",
+            file=sys.stderr,
+        )
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1 +1,16 @@
-from .parsers import Timepad, Radario, ALL_EVENT_TAGS
+from .crawler import crawl
+from .parsers import ALL_EVENT_TAGS, all_parsers
+
+
+def __getattr__(name):
+    # parsers are imported on first use (see escraper.parsers)
+    if name in ("Timepad", "Radario"):
+        from . import parsers
+
+        return getattr(parsers, name)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + ["Timepad", "Radario"])
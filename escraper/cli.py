@@ -0,0 +1,224 @@
+"""
+Command line interface: crawl sources and write events to file.
+
+Examples:
+---------
+$ escraper timepad radario \\
+    --params timepad='{"cities": "Санкт-Петербург"}' \\
+    --params radario='{"category": ["concert"]}' \\
+    --tags title,date_from,url --concurrency 16 --timeout 120 \\
+    --output events.parquet
+"""
+import argparse
+import inspect
+import json
+import sys
+import time
+
+from .crawler import crawl
+from .parsers import ALL_EVENT_TAGS, all_parsers
+from .sinks import SINKS, open_sink
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="escraper",
+        description="Get events from several sources concurrently "
+        "and write them to file.",
+    )
+    parser.add_argument(
+        "sources",
+        nargs="*",
+        metavar="source",
+        help=f"Sources to crawl: {', '.join(all_parsers)} (default all)",
+    )
+    parser.add_argument(
+        "-p",
+        "--params",
+        action="append",
+        default=list(),
+        metavar="SOURCE=JSON",
+        help=(
+            "Request parameters of source as json object (see parser get_events), "
+            "'limit' is the number of events, as in get_events"
+        ),
+    )
+    parser.add_argument(
+        "-t",
+        "--tags",
+        default=",".join(ALL_EVENT_TAGS),
+        help="Comma separated event tags (default all tags)",
+    )
+    parser.add_argument(
+        "-c",
+        "--concurrency",
+        type=int,
+        default=None,
+        help="Concurrent requests per source (default by parser settings)",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=None,
+        help="Max crawl time of source in seconds (default no timeout)",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default="events.jsonl",
+        help="Output file (default events.jsonl)",
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        choices=list(SINKS),
+        default=None,
+        help="Output format (default by output file extension)",
+    )
+    parser.add_argument(
+        "--state",
+        default=None,
+        help="State file for incremental crawl: skip known unchanged events",
+    )
+
+    args = parser.parse_args(argv)
+    args.sources = args.sources or list(all_parsers)
+
+    for source in args.sources:
+        if source not in all_parsers:
+            parser.error(
+                f"unknown source {source!r} (choose from {', '.join(all_parsers)})"
+            )
+
+    try:
+        args.request_params = parse_params(args.params, args.sources)
+        args.tags = parse_tags(args.tags)
+
+    except ValueError as e:
+        parser.error(str(e))
+
+    return args
+
+
+def parse_params(params, sources):
+    """
+    {source: request parameters} from "source=json" strings.
+    """
+    request_params = dict.fromkeys(sources)
+
+    for value in params:
+        source, _, params_json = value.partition("=")
+
+        if source not in request_params:
+            raise ValueError(f"parameters for not selected source {source!r}")
+
+        request_params[source] = json.loads(params_json)
+
+    return request_params
+
+
+def parse_tags(tags):
+    """
+    List of event tags from comma separated string.
+    """
+    tags = [tag.strip() for tag in tags.split(",") if tag.strip()]
+
+    unknown = [tag for tag in tags if tag not in ALL_EVENT_TAGS]
+    if unknown:
+        raise ValueError(
+            f"unknown tags: {', '.join(unknown)} "
+            f"(choose from {', '.join(ALL_EVENT_TAGS)})"
+        )
+
+    return tags
+
+
+def create_parser(name, concurrency=None, state=None):
+    """
+    Parser instance with concurrency settings, that it supports.
+    """
+    parser_class = all_parsers[name]
+    parameters = inspect.signature(parser_class.__init__).parameters
+
+    kwargs = dict(state=state)
+    if concurrency is not None:
+        kwargs["pool_size"] = concurrency
+
+        if "max_workers" in parameters:
+            kwargs["max_workers"] = concurrency
+
+    return parser_class(**kwargs)
+
+
+def format_bytes(size):
+    if size < 1024:
+        return f"{size:.0f} B"
+
+    for unit in ("KB", "MB", "GB"):
+        size /= 1024
+        if size < 1024 or unit == "GB":
+            return f"{size:.1f} {unit}"
+
+
+def main(argv=None):
+    """
+    Run command line interface, return exit code:
+    1 if any source failed or timed out, else 0.
+    """
+    args = parse_args(argv)
+    request_params = args.request_params
+
+    state = None
+    if args.state is not None:
+        from .parsers.state import StateStore
+
+        state = StateStore(args.state)
+
+    failures = dict()
+    started_at = time.monotonic()
+
+    try:
+        parsers = {
+            name: create_parser(name, args.concurrency, state)
+            for name in request_params
+        }
+
+        with open_sink(args.output, format=args.format) as sink:
+            sink.write_many(
+                crawl(
+                    request_params,
+                    tags=args.tags,
+                    timeout=args.timeout,
+                    parsers=parsers,
+                    failures=failures,
+                )
+            )
+
+    finally:
+        if state is not None:
+            state.close()
+
+    elapsed = max(time.monotonic() - started_at, 1e-9)
+
+    stats = [parser.sessions.stats for parser in parsers.values()]
+    requests_count = sum(parser_stats["requests"] for parser_stats in stats)
+    bytes_count = sum(parser_stats["bytes"] for parser_stats in stats)
+
+    print(
+        f"{sink.count} events in {elapsed:.1f}s: "
+        f"{sink.count / elapsed:.1f} events/s, "
+        f"{requests_count} requests ({requests_count / elapsed:.1f} requests/s), "
+        f"{format_bytes(bytes_count)} ({format_bytes(bytes_count / elapsed)}/s). "
+        f"Events saved to {args.output}",
+        file=sys.stderr,
+    )
+
+    if failures:
+        print(f"Failed sources: {', '.join(failures)}", file=sys.stderr)
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
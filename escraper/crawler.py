@@ -0,0 +1,185 @@
+"""
+Concurrent crawl of several sources (parsers from all_parsers).
+"""
+import queue
+import threading
+import time
+import warnings
+from collections import namedtuple
+
+from .parsers import all_parsers
+
+
+SourceEvent = namedtuple("SourceEvent", ("source", "event"))
+
+_DONE = object()  # end of source events in queue
+QUEUE_SIZE = 1000  # max events in queue: slow consumer pauses sources
+
+
+def crawl(request_params, tags=None, timeout=None, parsers=None, failures=None):
+    """
+    Get events from several sources concurrently.
+
+    Every source is crawled in its own thread, events are yielded
+    as soon as they are parsed (Timepad events by pages, see
+    Timepad.iter_events), so total crawl time is the time
+    of the slowest source.
+
+    Parameters:
+    -----------
+    request_params : dict
+        {parser name: request parameters (or None)} - sources to crawl
+        (see escraper.all_parsers), parameters see parser get_events.
+        'limit' is the number of events as in get_events: source with
+        'limit' is crawled by get_events, not by pages of iter_events
+
+    tags : list of tags, default all available event tags
+        Event tags (see all tags in 'escraper.ALL_EVENT_TAGS')
+
+    timeout : float or dict, default None (no timeout)
+        Max crawl time of source in seconds or {parser name: timeout}.
+        Events of source after timeout are dropped with warning
+        (already yielded events are kept).
+
+    parsers : dict, default None
+        {parser name: parser instance} - parsers with custom settings,
+        other parsers are created with default settings
+
+    failures : dict, default None
+        If set, {parser name: exception} of failed sources is added to it
+        (TimeoutError for timed out source)
+
+    Yields:
+    -------
+    SourceEvent(source=parser name, event=event namedtuple)
+
+    Sources wait, while consumer doesn't take events (QUEUE_SIZE events
+    are buffered), and are stopped, when generator is closed.
+
+    Examples:
+    ---------
+    >>> request_params = dict(
+            timepad=dict(cities="Санкт-Петербург"),
+            radario=dict(category=["concert"]),
+        )
+    >>> for source, event in crawl(request_params, timeout=60):
+    ...     print(source, event.title)
+    """
+    parsers = dict(parsers or dict())
+    for name in request_params:
+        if name not in parsers:
+            parsers[name] = all_parsers[name]()
+
+    if not isinstance(timeout, dict):
+        timeout = dict.fromkeys(request_params, timeout)
+
+    events = queue.Queue(maxsize=QUEUE_SIZE)
+    stopped = {name: threading.Event() for name in request_params}
+    started_at = time.monotonic()
+
+    for name, params in request_params.items():
+        # daemon threads: source, that is stuck in request, doesn't block exit
+        threading.Thread(
+            target=_crawl_source,
+            args=(name, parsers[name], params, tags, events, stopped[name]),
+            name=f"escraper-crawl-{name}",
+            daemon=True,
+        ).start()
+
+    deadlines = {
+        name: started_at + timeout[name]
+        for name in request_params
+        if timeout.get(name) is not None
+    }
+    pending = set(request_params)
+
+    try:
+        while pending:
+            try:
+                name, event = events.get(timeout=_wait_time(pending, deadlines))
+
+            except queue.Empty:
+                name, event = None, None
+
+            now = time.monotonic()
+            expired = [source for source in pending if deadlines.get(source, now) < now]
+            for source in expired:
+                warnings.warn(
+                    f"Source {source!r} timed out after {timeout[source]}s, "
+                    "its other events are dropped.",
+                    UserWarning,
+                )
+                stopped[source].set()
+                pending.discard(source)
+
+                if failures is not None:
+                    failures[source] = TimeoutError(
+                        f"Source {source!r} timed out after {timeout[source]}s."
+                    )
+
+            if name not in pending:
+                continue
+
+            if event is _DONE:
+                pending.discard(name)
+
+            elif isinstance(event, Exception):
+                warnings.warn(f"Source {name!r} failed: {event!r}.", UserWarning)
+                pending.discard(name)
+
+                if failures is not None:
+                    failures[name] = event
+
+            elif event is not None:
+                yield SourceEvent(name, event)
+
+    finally:
+        # stop sources also after error or when consumer stopped iteration
+        for flag in stopped.values():
+            flag.set()
+
+
+def _wait_time(pending, deadlines):
+    pending_deadlines = [deadlines[name] for name in pending if name in deadlines]
+    if not pending_deadlines:
+        return None
+
+    return max(min(pending_deadlines) - time.monotonic(), 0)
+
+
+def _crawl_source(name, parser, request_params, tags, events, stopped):
+    """
+    Put events of source to queue (stop after ``stopped`` is set).
+    """
+    try:
+        # 'limit' would be page size of iter_events, not number of events
+        if hasattr(parser, "iter_events") and "limit" not in (request_params or {}):
+            source_events = parser.iter_events(request_params=request_params, tags=tags)
+        else:
+            source_events = parser.get_events(request_params=request_params, tags=tags)
+
+        for event in source_events:
+            if not _put(events, (name, event), stopped):
+                return
+
+    except Exception as e:
+        _put(events, (name, e), stopped)
+
+    else:
+        _put(events, (name, _DONE), stopped)
+
+
+def _put(events, item, stopped, poll=0.1):
+    """
+    Put item to queue, waiting while queue is full.
+    Return False, if source was stopped before.
+    """
+    while not stopped.is_set():
+        try:
+            events.put(item, timeout=poll)
+            return True
+
+        except queue.Full:
+            pass
+
+    return False
@@ -0,0 +1,223 @@
+"""
+Duplicate detection of events from different sources
+(e.g. the same concert on timepad and radario).
+"""
+import re
+import zlib
+from collections import defaultdict
+
+
+NOT_WORD_RE = re.compile(r"[^\w]+")
+
+
+def normalize_text(text):
+    """
+    Lowercase words of text without punctuation and emoji.
+    """
+    return NOT_WORD_RE.sub(" ", (text or "").casefold().replace("ё", "е")).strip()
+
+
+def event_features(event, shingle_size=3):
+    """
+    Features of event for similarity: character shingles
+    of normalized title and words of normalized place name.
+    """
+    title = normalize_text(event.title)
+
+    features = {
+        title[i : i + shingle_size]
+        for i in range(max(len(title) - shingle_size + 1, 1))
+    }
+    features.update(
+        "place:" + word for word in normalize_text(event.place_name).split()
+    )
+
+    return frozenset(features)
+
+
+def date_bucket(event):
+    """
+    Events are compared only with events of the same day.
+    """
+    return event.date_from.date() if event.date_from is not None else None
+
+
+def jaccard(first, second):
+    if not first and not second:
+        return 1.0
+
+    return len(first & second) / len(first | second)
+
+
+class DedupIndex:
+    """
+    Index of events for duplicates search.
+
+    Events are compared by normalized title and place name
+    (see event_features) in the same date_from day. Candidates
+    are found by MinHash signatures with LSH (locality sensitive hashing)
+    bands: only events with the same band of signature are compared,
+    so each new event is compared with a few similar events
+    instead of all events. Duplicates are joined to clusters
+    (union-find), also transitively.
+
+    Events should have title, place_name and date_from tags.
+
+    Parameters:
+    -----------
+    threshold : float, default 0.5
+        Min Jaccard similarity of features for duplicates
+
+    num_perm : int, default 16
+        MinHash signature size
+
+    bands : int, default 8
+        Number of LSH bands (num_perm should be divisible by bands),
+        more bands find more candidates with lower similarity
+
+    seed : int, default 1
+        Seed of features hash
+
+    Examples:
+    ---------
+    >>> index = DedupIndex()
+    >>> index.update(timepad.get_events(request_params, tags=tags))
+    >>> index.update(radario.get_events(request_params, tags=tags))
+    >>> index.clusters()
+    [[<timepad event>, <radario event>], ...]
+    >>> index.unique()
+    <list of events without duplicates>
+    """
+
+    def __init__(self, threshold=0.5, num_perm=16, bands=8, seed=1):
+        if num_perm % bands:
+            raise ValueError(
+                f"'num_perm' ({num_perm}) should be divisible by 'bands' ({bands})."
+            )
+
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+
+        self.num_perm = num_perm
+        self.seed = seed
+
+        self.events = list()
+        self._features = list()
+        self._parents = list()
+        # (date bucket, band number, band of signature) -> event indexes
+        self._buckets = defaultdict(list)
+
+    def __len__(self):
+        return len(self.events)
+
+    def add(self, event):
+        """
+        Add event to index, return its index
+        (events of the same cluster are joined immediately).
+        """
+        index = len(self.events)
+        features = event_features(event)
+
+        self.events.append(event)
+        self._features.append(features)
+        self._parents.append(index)
+
+        signature = self._signature(features)
+        day = date_bucket(event)
+        candidates = set()
+
+        for band in range(self.bands):
+            key = (day, band, signature[band * self.rows : (band + 1) * self.rows])
+            candidates.update(self._buckets[key])
+            self._buckets[key].append(index)
+
+        for candidate in candidates:
+            if self._find(candidate) == self._find(index):
+                continue
+
+            if jaccard(features, self._features[candidate]) >= self.threshold:
+                self._union(candidate, index)
+
+        return index
+
+    def update(self, events):
+        """
+        Add events to index (None events are skipped).
+        """
+        for event in events:
+            if event is not None:
+                self.add(event)
+
+    def cluster(self, index):
+        """
+        Events of the same cluster as event with index.
+        """
+        root = self._find(index)
+        return [
+            event
+            for other, event in enumerate(self.events)
+            if self._find(other) == root
+        ]
+
+    def clusters(self, min_size=2):
+        """
+        Clusters of duplicates (events in insertion order),
+        ``min_size=1`` returns events without duplicates too.
+        """
+        clusters = defaultdict(list)
+        for index, event in enumerate(self.events):
+            clusters[self._find(index)].append(event)
+
+        return [cluster for cluster in clusters.values() if len(cluster) >= min_size]
+
+    def unique(self):
+        """
+        First added event of every cluster.
+        """
+        return [cluster[0] for cluster in self.clusters(min_size=1)]
+
+    def _signature(self, features):
+        """
+        MinHash signature by one permutation hashing: each feature
+        is hashed once to one of num_perm bins, empty bins are filled
+        from next not empty bin (densification).
+        """
+        num_perm = self.num_perm
+        bins = [None] * num_perm
+
+        for feature in features:
+            value = zlib.crc32(feature.encode(), self.seed)
+            position = value % num_perm
+            value //= num_perm
+
+            if bins[position] is None or value < bins[position]:
+                bins[position] = value
+
+        signature = list(bins)
+        for position in range(num_perm):
+            offset = 1
+            while signature[position] is None:
+                # features are never empty, so some bin is filled
+                donor = bins[(position + offset) % num_perm]
+                if donor is not None:
+                    signature[position] = (donor, offset)
+                offset += 1
+
+        return tuple(signature)
+
+    def _find(self, index):
+        parents = self._parents
+
+        while parents[index] != index:
+            parents[index] = parents[parents[index]]
+            index = parents[index]
+
+        return index
+
+    def _union(self, first, second):
+        first, second = self._find(first), self._find(second)
+
+        if first != second:
+            # earlier event is root, so clusters keep insertion order
+            self._parents[max(first, second)] = min(first, second)
@@ -1,4 +1,6 @@
 import random
+import re
+from functools import lru_cache
 
 emoji_dict = {
     "залив": ["🌊", "🏄", "🏖", "🏝", "🏝", "🌴", "🐠"],
@@ -35,14 +37,112 @@ emoji_dict = {
 }
 
 
-def add_emoji(title):
-    emoji = None
+class KeywordMatcher:
+    """
+    Find keyword of highest priority (first in keywords order),
+    that is in text, by single pass of one compiled regexp.
 
-    for word in list(emoji_dict.keys()):
-        if title.lower().find(word) != -1:
-            emoji = random.choice(emoji_dict[word])
-            break
-    if emoji is None:
-        emoji = random.choice(emoji_dict["другое"])
+    Regexp is built from keywords trie (keywords with common prefix
+    share one branch), so at each text position only branches by next
+    character are checked, not all keywords: matching time depends
+    on text length, not on number of keywords.
+
+    Parameters:
+    -----------
+    keywords : iterable of str
+        Keywords in priority order (matched in lowercase text)
+    """
+
+    def __init__(self, keywords):
+        self.keywords = tuple(keyword for keyword in keywords if keyword)
+
+        trie = dict()
+        for keyword in self.keywords:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, dict())
+            node[""] = keyword
+
+        # trie regexp matches the longest keyword at position,
+        # other keywords at this position are its prefixes:
+        # keyword -> priority of the best keyword among its prefixes
+        indexes = dict()
+        for index, keyword in enumerate(self.keywords):
+            indexes.setdefault(keyword, index)
+
+        self.priorities = {
+            keyword: min(
+                indexes.get(keyword[:end], index) for end in range(1, len(keyword) + 1)
+            )
+            for keyword, index in indexes.items()
+        }
+
+        # lookahead finds keyword at every position (even overlapping),
+        # "(?!)" never matches (no keywords)
+        self.pattern = re.compile("(?=({}))".format(_trie_pattern(trie) or "(?!)"))
+
+    def match(self, text):
+        """
+        Keyword of highest priority in text (None if no keywords found).
+        """
+        best = None
+
+        for match in self.pattern.finditer(text.lower()):
+            priority = self.priorities[match.group(1)]
+
+            if best is None or priority < best:
+                best = priority
+
+                if best == 0:
+                    break
+
+        return None if best is None else self.keywords[best]
+
+
+def _trie_pattern(trie):
+    """
+    Regexp of trie node: {char: child node, "": keyword (for keyword end)}.
+    """
+    branches = [
+        re.escape(char) + _trie_pattern(child)
+        for char, child in trie.items()
+        if char
+    ]
+
+    if not branches:
+        return ""
+
+    pattern = "(?:{})".format("|".join(branches)) if len(branches) > 1 else branches[0]
+
+    # greedy optional continuation: the longest keyword is matched
+    return "(?:{})?".format(pattern) if "" in trie else pattern
+
+
+@lru_cache(maxsize=None)
+def get_matcher():
+    """
+    KeywordMatcher for emoji_dict, compiled on first call
+    (call get_matcher.cache_clear() after emoji_dict changes).
+    """
+    return KeywordMatcher(emoji_dict)
+
+
+def add_emoji(title, rng=None):
+    """
+    Add emoji by title keyword (or random animal) before title.
+
+    Parameters:
+    -----------
+    title : str
+        Event title
+
+    rng : random.Random, default None (global random)
+        Random generator for emoji choice, e.g. random.Random(seed)
+        for reproducible titles
+    """
+    rng = rng or random
+
+    word = get_matcher().match(title)
+    emoji = rng.choice(emoji_dict[word or "другое"])
 
     return f"{emoji} {title}"
@@ -1,8 +1,59 @@
-from .base import ALL_EVENT_TAGS
-from .timepad import Timepad
-from .radario import Radario
+"""
+Parsers are imported on first use: importing escraper.parsers
+doesn't import requests, bs4, pytz etc.
+"""
+from collections.abc import Mapping
+from importlib import import_module
 
-all_parsers = dict(
-    timepad=Timepad,
-    radario=Radario,
+from .utils import ALL_EVENT_TAGS
+
+
+# parser name -> (module, class name)
+PARSERS = dict(
+    timepad=("timepad", "Timepad"),
+    radario=("radario", "Radario"),
 )
+
+
+def _import_parser(name):
+    module, class_name = PARSERS[name]
+    return getattr(import_module(f"{__name__}.{module}"), class_name)
+
+
+class ParsersRegistry(Mapping):
+    """
+    Read-only {name: parser class} mapping,
+    parser module is imported on first access by name.
+    """
+
+    def __getitem__(self, name):
+        if name not in PARSERS:
+            raise KeyError(name)
+
+        return _import_parser(name)
+
+    def __iter__(self):
+        return iter(PARSERS)
+
+    def __len__(self):
+        return len(PARSERS)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+all_parsers = ParsersRegistry()
+
+
+def __getattr__(name):
+    for parser_name, (_, class_name) in PARSERS.items():
+        if name == class_name:
+            return _import_parser(parser_name)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(
+        list(globals()) + [class_name for _, class_name in PARSERS.values()]
+    )
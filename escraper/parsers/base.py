@@ -1,31 +1,195 @@
+import asyncio
+import random
+import re
+import time
 import warnings
 from abc import ABC, abstractmethod
 from datetime import datetime
 from collections import namedtuple
+from functools import lru_cache
 
 import requests
-from bs4 import BeautifulSoup
-
-
-ALL_EVENT_TAGS = (
-    "adress",
-    "category",
-    "date_from",
-    "date_to",
-    "date_from_to",
-    "id",
-    "place_name",
-    "post_text",
-    "poster_imag",
-    "price",
-    "title",
-    "url",
-    "is_registration_open",
-)
+
+from .http import SessionPool, async_connection_errors, async_get
+from .retry import HostRateLimiter, RetryPolicy
+from .utils import ALL_EVENT_TAGS, strip_html_tags, truncate_text
+
+
+@lru_cache(maxsize=None)
+def event_record(tags):
+    """
+    Event namedtuple class for tags (one class per tags).
+    """
+    return namedtuple("event", tags)
+
+
+class LazyEvent:
+    """
+    Event record, that keeps raw event data and computes
+    each tag on first access (then value is cached).
+
+    Has the same read interface as event namedtuple:
+    attributes, _fields, _asdict(), iteration, indexing and hashing.
+    Raw event data is released, when all tags are computed.
+    """
+
+    __slots__ = ("_data", "_extractors", "_values")
+    _fields = tuple()
+
+    def __init__(self, event_data, extractors):
+        self._data = event_data
+        self._extractors = extractors
+        self._values = dict()
+
+    def _get(self, index):
+        tag = self._fields[index]
+
+        if tag not in self._values:
+            self._values[tag] = self._extractors[index](self._data)
+
+            if len(self._values) == len(self._fields):
+                # all tags are computed, raw data is not needed anymore
+                self._data = self._extractors = None
+
+        return self._values[tag]
+
+    def _asdict(self):
+        return {tag: self._get(index) for index, tag in enumerate(self._fields)}
+
+    def _to_record(self):
+        """
+        Compute all tags and return event namedtuple.
+        """
+        return event_record(self._fields)._make(self)
+
+    def __iter__(self):
+        return (self._get(index) for index in range(len(self._fields)))
+
+    def __len__(self):
+        return len(self._fields)
+
+    def __getitem__(self, index):
+        return tuple(self)[index] if isinstance(index, slice) else self._get(index)
+
+    def __eq__(self, other):
+        if isinstance(other, (tuple, LazyEvent)):
+            return tuple(self) == tuple(other)
+
+        return NotImplemented
+
+    def __hash__(self):
+        # computes all tags, hash is the same as of event namedtuple
+        return hash(tuple(self))
+
+    def __repr__(self):
+        values = ", ".join(
+            f"{tag}={self._values[tag]!r}" if tag in self._values else f"{tag}=<lazy>"
+            for tag in self._fields
+        )
+        return f"lazy_event({values})"
+
+
+def _lazy_field(index, tag):
+    return property(lambda self: self._get(index), doc=f"Event {tag} (lazy)")
+
+
+@lru_cache(maxsize=None)
+def lazy_event_record(tags):
+    """
+    LazyEvent class for tags (one class per tags).
+    """
+    namespace = {tag: _lazy_field(index, tag) for index, tag in enumerate(tags)}
+    namespace.update(__slots__=tuple(), _fields=tags)
+
+    return type("lazy_event", (LazyEvent,), namespace)
 
 
 class BaseParser(ABC):
     MAX_NUMBER_CONNECTION_ATTEMPTS = 3
+    POOL_SIZE = 10  # kept connections per host
+    TIMEOUT = (5, 30)  # connect and read timeouts in seconds
+    RATE_LIMITS = dict()  # {host: rate} or {host: (rate, burst)}
+    CACHE_URL_PATTERNS = tuple()  # regexps for urls, that may be cached
+
+    def __init__(
+        self,
+        pool_size=None,
+        timeout=None,
+        retry_policy=None,
+        rate_limits=None,
+        cache=None,
+        lazy=False,
+        emoji_seed=None,
+        state=None,
+        cassette=None,
+    ):
+        """
+        Parameters:
+        -----------
+        pool_size : int, default BaseParser.POOL_SIZE
+            Max number of kept connections per host
+
+        timeout : float or tuple (connect, read), default BaseParser.TIMEOUT
+            Default request timeout in seconds
+
+        retry_policy : escraper.parsers.retry.RetryPolicy, default None
+            Retry policy for bad responses and connection errors
+            (default exponential backoff with
+            BaseParser.MAX_NUMBER_CONNECTION_ATTEMPTS retries)
+
+        rate_limits : dict, default BaseParser.RATE_LIMITS
+            Requests per second by host: {host: rate} or {host: (rate, burst)}
+
+        cache : escraper.parsers.cache.HttpCache or path, default None
+            HTTP cache for urls matching CACHE_URL_PATTERNS
+            (sync requests only). Path means HttpCache with default settings.
+
+        lazy : bool, default False
+            Return lazy events by default (see BaseParser.parse)
+
+        emoji_seed : int, default None
+            Seed for random emoji in event titles (reproducible titles),
+            None means global random
+
+        state : escraper.parsers.state.StateStore or path, default None
+            Seen events store for incremental crawling: get_events skips
+            known events, that weren't changed. Path means StateStore
+            in this file.
+
+        cassette : escraper.parsers.cassette.Cassette, default None
+            Record responses to cassette or replay them without network
+        """
+        self.sessions = SessionPool(
+            pool_size=pool_size or self.POOL_SIZE,
+            timeout=timeout or self.TIMEOUT,
+        )
+        self.retry_policy = retry_policy or RetryPolicy(
+            max_retries=self.MAX_NUMBER_CONNECTION_ATTEMPTS
+        )
+        self.rate_limiter = HostRateLimiter(
+            self.RATE_LIMITS if rate_limits is None else rate_limits
+        )
+
+        if cache is not None:
+            from .cache import HttpCache
+
+            if not isinstance(cache, HttpCache):
+                cache = HttpCache(cache)
+        self.cache = cache
+
+        self.lazy = lazy
+        self._tag_plans = dict()
+
+        self.emoji_rng = None if emoji_seed is None else random.Random(emoji_seed)
+
+        if state is not None:
+            from .state import StateStore
+
+            if not isinstance(state, StateStore):
+                state = StateStore(state)
+        self.state = state
+
+        self.cassette = cassette
 
     @abstractmethod
     def get_event(self):
@@ -83,83 +247,228 @@ class BaseParser(ABC):
     def _is_registration_open(self) -> bool:
         """Event registration status"""
 
-    def parse(self, event_data, tags=None):
+    def parse(self, event_data, tags=None, lazy=None):
+        """
+        Parse event data to event record with tags.
+
+        Parameters:
+        -----------
+        event_data
+            Raw event data (timepad json, radario event page etc.)
+
+        tags : list of tags
+            Event tags (see all tags in 'escraper.ALL_EVENT_TAGS')
+
+        lazy : bool, default BaseParser.lazy
+            If True, return LazyEvent, that computes each tag
+            only on first access. Otherwise return event namedtuple.
+        """
         if tags is None:
             raise ValueError("'tags' for event required (see escraper.ALL_EVENT_TAGS).")
 
-        data = dict()
-        for tag in tags:
-            try:
-                data[tag] = getattr(self, "_" + tag)(event_data)
-            except AttributeError:
-                raise TypeError(
-                    f"Unsupported event tag found: {tag}.\n"
-                    f"All available event tags: {ALL_EVENT_TAGS}."
-                )
+        record, extractors = self._tag_plan(tags)
+
+        if self.lazy if lazy is None else lazy:
+            return lazy_event_record(record._fields)(event_data, extractors)
+
+        return record._make([extract(event_data) for extract in extractors])
+
+    def _tag_plan(self, tags):
+        """
+        Record class and tag getters for tags,
+        created once per tags for parser instance.
+        """
+        tags = tuple(tags)
+        plan = self._tag_plans.get(tags)
+
+        if plan is None:
+            for tag in tags:
+                if tag not in ALL_EVENT_TAGS:
+                    raise TypeError(
+                        f"Unsupported event tag found: {tag}.\n"
+                        f"All available event tags: {ALL_EVENT_TAGS}."
+                    )
 
-        DataStorage = namedtuple("event", tags)
+            extractors = [getattr(self, "_" + tag) for tag in tags]
+            plan = self._tag_plans[tags] = (event_record(tags), extractors)
 
-        return DataStorage(**data)
+        return plan
 
     def remove_html_tags(self, data):
+        from bs4 import BeautifulSoup
+
         return BeautifulSoup(data, "html.parser").text
 
-    def _request_get(self, *args, **kwargs):
+    def strip_html_tags(self, data):
+        """
+        Fast version of remove_html_tags, that doesn't build soup
+        (see escraper.parsers.utils.strip_html_tags).
+        """
+        return strip_html_tags(data)
+
+    def _bad_response_message(self, response):
+        try:
+            response_status = response.json()["response_status"]
+
+        except (ValueError, KeyError, TypeError):
+            if response.content:
+                message = "unknown response content"
+            else:
+                message = "response content is empty"
+
+            response_status = dict(
+                error_code=getattr(response, "status_code", "None"),
+                message=message,
+            )
+
+        return "Bad response: {status_code}: {message}.".format(
+            status_code=response_status["error_code"],
+            message=response_status["message"],
+        )
+
+    def _retry_delay(self, url, attempts_count, response=None):
+        """
+        Delay before next attempt by retry policy.
+        After 429 response all requests to host are paused for this delay.
+        """
+        delay = self.retry_policy.delay(attempts_count, response)
+
+        if getattr(response, "status_code", None) == 429:
+            self.rate_limiter.pause(url, delay)
+
+        return delay
+
+    def _is_cacheable(self, url):
+        return any(re.search(pattern, url) for pattern in self.CACHE_URL_PATTERNS)
+
+    def _get(self, url, **kwargs):
+        """
+        Single get request (through HTTP cache, if url is cacheable),
+        recorded to or replayed from cassette, if it is set.
+        """
+        if self.cassette is None:
+            return self._fetch(url, **kwargs)
+
+        response = self.cassette.get(self._fetch, url, **kwargs)
+        if not self.cassette.recording:
+            self.sessions.count(response)
+
+        return response
+
+    def _fetch(self, url, **kwargs):
+        if self.cache is not None and self._is_cacheable(url):
+            return self.cache.get(self.sessions.get, url, **kwargs)
+
+        return self.sessions.get(url, **kwargs)
+
+    async def _get_async(self, url, session, **kwargs):
+        """
+        Async counterpart of ``_get`` (without HTTP cache).
+        """
+        if self.cassette is None:
+            return await self._fetch_async(url, session=session, **kwargs)
+
+        response = await self.cassette.get_async(
+            self._fetch_async, url, session=session, **kwargs
+        )
+        if not self.cassette.recording:
+            self.sessions.count(response)
+
+        return response
+
+    async def _fetch_async(self, url, session, **kwargs):
+        response = await async_get(url, session=session, **kwargs)
+        self.sessions.count(response)
+
+        return response
+
+    def _request_get(self, url, **kwargs):
         """
         Send get request with specific arguments.
 
-        To avoid internet connection issues,
-        will catch ConnectionError and retry.
+        Requests are limited by BaseParser.rate_limiter.
+        Connection errors and bad responses are retried
+        by BaseParser.retry_policy (with backoff delays).
+        Return None if response is still bad.
         """
         attempts_count = 0
 
         while True:
+            self.rate_limiter.acquire(url)
+
             try:
-                response = requests.get(*args, **kwargs)
+                response = self._get(url, **kwargs)
+
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if not self.retry_policy.retry_exception(e, attempts_count):
+                    raise e
+
+                print("Retry connection")
+                time.sleep(self._retry_delay(url, attempts_count))
+                attempts_count += 1
+                continue
 
-                if not response.ok:
-                    if response.content:
-                        response_status = response.json()["response_status"]
+            if response.ok:
+                return response
 
-                    else:
-                        response_status = dict(
-                            error_code="None",
-                            message="response content is empty",
-                        )
+            warning_msg = self._bad_response_message(response)
 
-                    warning_msg = "Bad response: {status_code}: {message}.".format(
-                        status_code=response_status["error_code"],
-                        message=response_status["message"],
-                    )
+            if not self.retry_policy.retry_response(response, attempts_count):
+                warnings.warn(warning_msg + "\nBreak (event counts 0)", UserWarning)
+                return None
+
+            delay = self._retry_delay(url, attempts_count, response)
+            warnings.warn(warning_msg + f"\nRetry in {delay:.1f}s", UserWarning)
+            time.sleep(delay)
+            attempts_count += 1
+
+    async def _request_get_async(self, url, session=None, **kwargs):
+        """
+        Async counterpart of ``_request_get`` (requires aiohttp).
+
+        Requests through ``session`` (see SessionPool.async_session),
+        if session is None, new session will be used for this request only.
 
-                    if attempts_count == self.MAX_NUMBER_CONNECTION_ATTEMPTS:
-                        response = None
-                        warnings.warn(warning_msg + "\nBreak (event counts 0)", UserWarning)
-                        break
+        Return requests-like response (see escraper.parsers.http.Response).
+        """
+        if session is None:
+            async with self.sessions.async_session() as session:
+                return await self._request_get_async(url, session=session, **kwargs)
 
-                    warnings.warn(warning_msg + "\nRetry", UserWarning)
-                    attempts_count += 1
+        attempts_count = 0
 
-                else:
-                    break
+        while True:
+            await self.rate_limiter.acquire_async(url)
 
-            except requests.ConnectionError as e:
-                if attempts_count == self.MAX_NUMBER_CONNECTION_ATTEMPTS:
+            try:
+                response = await self._get_async(url, session, **kwargs)
+
+            except async_connection_errors() as e:
+                if not self.retry_policy.retry_exception(e, attempts_count):
                     raise e
-                attempts_count += 1
+
                 print("Retry connection")
+                await asyncio.sleep(self._retry_delay(url, attempts_count))
+                attempts_count += 1
+                continue
 
-        return response
+            if response.ok:
+                return response
+
+            warning_msg = self._bad_response_message(response)
+
+            if not self.retry_policy.retry_response(response, attempts_count):
+                warnings.warn(warning_msg + "\nBreak (event counts 0)", UserWarning)
+                return None
+
+            delay = self._retry_delay(url, attempts_count, response)
+            warnings.warn(warning_msg + f"\nRetry in {delay:.1f}s", UserWarning)
+            await asyncio.sleep(delay)
+            attempts_count += 1
 
     def prepare_post_text(self, post_text):
-        if len(post_text) > 550:
-            sentences = post_text.split(".")
-            post = ""
-            for s in sentences:
-                if len(post) < 365:
-                    post = post + s + "."
-                else:
-                    post_text = post
-                    break
-
-        return post_text
+        """
+        Cut long post text after sentence end
+        (see escraper.parsers.utils.truncate_text).
+        """
+        return truncate_text(post_text)
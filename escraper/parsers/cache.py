@@ -0,0 +1,219 @@
+"""
+On-disk HTTP cache with conditional requests (ETag / Last-Modified).
+"""
+import json
+import sqlite3
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+
+from .http import Response
+
+
+class HttpCache:
+    """
+    HTTP cache in sqlite database file.
+
+    Cached response is returned without request while it is fresh
+    (see ``ttl``), after that it is revalidated with If-None-Match /
+    If-Modified-Since headers: 304 response returns cached response.
+
+    Parameters:
+    -----------
+    path : str or Path
+        Cache database file (created if doesn't exist)
+
+    max_size : int, default 100 MB
+        Max size of cached contents in bytes,
+        least recently used responses are removed first
+
+    ttl : float, default 0
+        Seconds, while cached response is returned without revalidation
+
+    host_ttl : dict, default None
+        {host: ttl} - ttl override for specific hosts
+
+    Examples:
+    ---------
+    >>> cache = HttpCache("escraper.sqlite", host_ttl={"radario.ru": 3600})
+    >>> radario = Radario(cache=cache)
+    """
+
+    def __init__(self, path, max_size=100 * 2 ** 20, ttl=0, host_ttl=None):
+        self.path = str(path)
+        self.max_size = max_size
+        self.ttl = ttl
+        self.host_ttl = dict(host_ttl or {})
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                status_code INTEGER,
+                headers TEXT,
+                content BLOB,
+                encoding TEXT,
+                stored_at REAL,
+                accessed_at REAL,
+                size INTEGER
+            )
+            """
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS accessed_at_index ON responses (accessed_at)"
+        )
+        self._connection.commit()
+
+        self.size = self._connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+
+    def get(self, fetch, url, params=None, headers=None, **kwargs):
+        """
+        Get response by ``fetch(url, params=params, headers=headers, **kwargs)``
+        through cache.
+        """
+        key = self.key(url, params)
+        cached = self._load(key)
+
+        if cached is not None:
+            response, stored_at = cached
+
+            if time.time() - stored_at < self.get_ttl(url):
+                return response
+
+            headers = dict(headers or {}, **conditional_headers(response))
+
+        response = fetch(url, params=params, headers=headers, **kwargs)
+
+        if cached is not None and response.status_code == 304:
+            self._touch(key, revalidated=True)
+            return cached[0]
+
+        if response.status_code == 200:
+            self._store(key, response)
+
+        return response
+
+    def key(self, url, params=None):
+        return requests.Request("GET", url, params=params).prepare().url
+
+    def get_ttl(self, url):
+        return self.host_ttl.get(urlsplit(url).netloc, self.ttl)
+
+    def clear(self):
+        with self._lock:
+            self._connection.execute("DELETE FROM responses")
+            self._connection.commit()
+            self.size = 0
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def _load(self, key):
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT status_code, headers, content, encoding, stored_at "
+                "FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        status_code, headers, content, encoding, stored_at = row
+        self._touch(key)
+
+        response = Response(
+            url=key,
+            status_code=status_code,
+            headers=json.loads(headers),
+            content=content,
+            encoding=encoding,
+        )
+
+        return response, stored_at
+
+    def _touch(self, key, revalidated=False):
+        now = time.time()
+
+        with self._lock:
+            if revalidated:
+                self._connection.execute(
+                    "UPDATE responses SET accessed_at = ?, stored_at = ? WHERE key = ?",
+                    (now, now, key),
+                )
+            else:
+                self._connection.execute(
+                    "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+                )
+
+            self._connection.commit()
+
+    def _store(self, key, response):
+        if not conditional_headers(response) and not self.ttl and not self.host_ttl:
+            # can't be revalidated and will never be fresh
+            return
+
+        content = response.content
+        size = len(content)
+        if size > self.max_size:
+            return
+
+        now = time.time()
+        headers = json.dumps(dict(response.headers))
+
+        with self._lock:
+            old_size = self._connection.execute(
+                "SELECT size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            self.size -= old_size[0] if old_size else 0
+
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    response.status_code,
+                    headers,
+                    content,
+                    response.encoding,
+                    now,
+                    now,
+                    size,
+                ),
+            )
+            self.size += size
+
+            self._evict()
+            self._connection.commit()
+
+    def _evict(self):
+        """
+        Remove least recently used responses, while cache is too big.
+        """
+        while self.size > self.max_size:
+            key, size = self._connection.execute(
+                "SELECT key, size FROM responses ORDER BY accessed_at LIMIT 1"
+            ).fetchone()
+            self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self.size -= size
+
+
+def conditional_headers(response):
+    """
+    Headers for revalidation of cached response.
+    """
+    headers = dict()
+
+    if response.headers.get("ETag"):
+        headers["If-None-Match"] = response.headers["ETag"]
+
+    if response.headers.get("Last-Modified"):
+        headers["If-Modified-Since"] = response.headers["Last-Modified"]
+
+    return headers
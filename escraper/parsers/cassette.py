@@ -0,0 +1,177 @@
+"""
+Record and replay of parsers HTTP requests (offline, reproducible crawls).
+"""
+import asyncio
+import base64
+import gzip
+import json
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import urlencode
+
+from .http import Response
+
+
+class CassetteMissError(LookupError):
+    """Request was not recorded in cassette (replay mode)."""
+
+
+class Cassette:
+    """
+    Request -> response pairs in gzipped json lines file.
+
+    In "record" mode parser requests go to network as usual and
+    responses are recorded, in "replay" mode responses are returned
+    from cassette without network (CassetteMissError for unknown request).
+    Request key is url with query parameters (headers are not recorded,
+    so tokens are not saved). Repeated request is replayed in recorded order.
+
+    Parameters:
+    -----------
+    path : str or Path
+        Cassette file
+
+    mode : str, default "replay"
+        "record" or "replay"
+
+    latency : float, default 0
+        Simulated network delay of replayed response in seconds
+
+    Examples:
+    ---------
+    >>> with Cassette("radario.cassette", mode="record") as cassette:
+    ...     Radario(cassette=cassette).get_events(request_params)
+
+    >>> cassette = Cassette("radario.cassette", latency=0.1)
+    >>> Radario(cassette=cassette).get_events(request_params)  # offline
+    """
+
+    MODES = ("record", "replay")
+
+    def __init__(self, path, mode="replay", latency=0):
+        if mode not in self.MODES:
+            raise ValueError(
+                f"Unknown cassette mode {mode!r}, available modes: {self.MODES}."
+            )
+
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+
+        self._interactions = defaultdict(list)  # key -> [response record, ...]
+        self._played = defaultdict(int)  # key -> number of replayed responses
+        self._lock = threading.Lock()
+
+        if mode == "replay":
+            self.load()
+
+    @property
+    def recording(self):
+        return self.mode == "record"
+
+    def key(self, url, params=None):
+        params = sorted((params or dict()).items())
+        query = urlencode(
+            [(name, value) for name, value in params if value is not None], doseq=True
+        )
+
+        if not query:
+            return url
+
+        return url + ("&" if "?" in url else "?") + query
+
+    def get(self, fetch, url, params=None, **kwargs):
+        """
+        Record response of ``fetch(url, params=params, **kwargs)``
+        or replay recorded response.
+        """
+        if self.recording:
+            response = fetch(url, params=params, **kwargs)
+            self.record(url, params, response)
+            return response
+
+        time.sleep(self.latency)
+        return self.replay(url, params)
+
+    async def get_async(self, fetch, url, params=None, **kwargs):
+        """
+        Async version of Cassette.get, ``fetch`` is coroutine function.
+        """
+        if self.recording:
+            response = await fetch(url, params=params, **kwargs)
+            self.record(url, params, response)
+            return response
+
+        await asyncio.sleep(self.latency)
+        return self.replay(url, params)
+
+    def record(self, url, params, response):
+        content = response.content or b""
+
+        try:
+            body, encoded = content.decode("utf-8"), False
+        except UnicodeDecodeError:
+            body, encoded = base64.b64encode(content).decode("ascii"), True
+
+        record = dict(
+            status_code=response.status_code,
+            headers=dict(response.headers),
+            encoding=response.encoding,
+            body=body,
+            base64=encoded,
+        )
+
+        with self._lock:
+            self._interactions[self.key(url, params)].append(record)
+
+    def replay(self, url, params=None):
+        key = self.key(url, params)
+
+        with self._lock:
+            records = self._interactions.get(key)
+            if not records:
+                raise CassetteMissError(
+                    f"Request {key!r} is not in cassette {self.path}."
+                )
+
+            # repeated requests get responses in recorded order, then the last one
+            record = records[min(self._played[key], len(records) - 1)]
+            self._played[key] += 1
+
+        if record["base64"]:
+            content = base64.b64decode(record["body"])
+        else:
+            content = record["body"].encode("utf-8")
+
+        return Response(
+            url=key,
+            status_code=record["status_code"],
+            headers=record["headers"],
+            content=content,
+            encoding=record["encoding"],
+        )
+
+    def load(self):
+        with gzip.open(self.path, "rt", encoding="utf-8") as file:
+            for line in file:
+                interaction = json.loads(line)
+                self._interactions[interaction.pop("key")].append(interaction)
+
+    def save(self):
+        with self._lock:
+            with gzip.open(self.path, "wt", encoding="utf-8") as file:
+                for key, records in self._interactions.items():
+                    for record in records:
+                        line = json.dumps(dict(key=key, **record), ensure_ascii=False)
+                        file.write(line + "\n")
+
+    def __len__(self):
+        return sum(len(records) for records in self._interactions.values())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.recording:
+            self.save()
@@ -0,0 +1,220 @@
+"""
+HTTP layer shared by parsers.
+"""
+import asyncio
+import json
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util import make_headers
+
+
+# all compressions, that can be decoded in current environment
+DEFAULT_HEADERS = make_headers(accept_encoding=True)
+
+
+class Response:
+    """
+    Minimal requests-like response.
+
+    Used for responses that were received without ``requests``
+    (e.g. by aiohttp), so parsers can handle them in the same way.
+    """
+
+    def __init__(self, url, status_code, headers=None, content=b"", encoding=None):
+        self.url = url
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers or {})
+        self.content = content
+        self.encoding = encoding or "utf-8"
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding, errors="replace")
+
+    def json(self):
+        return json.loads(self.text)
+
+    def __bool__(self):
+        return self.ok
+
+    def __repr__(self):
+        return f"<Response [{self.status_code}]>"
+
+
+def import_aiohttp():
+    """
+    Import aiohttp on first async request (it is optional and slow to import).
+    """
+    try:
+        import aiohttp
+
+    except ImportError:
+        raise ImportError(
+            "Async requests require aiohttp: pip install escraper[async]"
+        ) from None
+
+    return aiohttp
+
+
+def async_connection_errors():
+    """
+    Errors of async requests, that may be retried.
+    """
+    return (import_aiohttp().ClientConnectionError, asyncio.TimeoutError)
+
+
+class SessionPool:
+    """
+    Keep-alive sessions, one per host.
+
+    Connections to host are reused by all requests through the pool
+    (up to ``pool_size`` simultaneously open connections per host).
+
+    Parameters:
+    -----------
+    pool_size : int, default 10
+        Max number of kept connections per host
+
+    timeout : float or tuple (connect, read), default (5, 30)
+        Default request timeout in seconds
+
+    headers : dict, default None
+        Headers for all requests (in addition to compression headers)
+    """
+
+    def __init__(self, pool_size=10, timeout=(5, 30), headers=None):
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.headers = dict(DEFAULT_HEADERS, **(headers or {}))
+
+        self._sessions = dict()
+        self._lock = threading.Lock()
+
+        self.requests_count = 0
+        self.bytes_count = 0
+
+    @property
+    def stats(self):
+        """
+        Number of sent requests and received bytes (of response content).
+        """
+        return dict(requests=self.requests_count, bytes=self.bytes_count)
+
+    def count(self, response):
+        """
+        Count request with response in SessionPool.stats.
+        """
+        size = len(getattr(response, "content", None) or b"")
+
+        with self._lock:
+            self.requests_count += 1
+            self.bytes_count += size
+
+    def session(self, url):
+        """
+        Get session for url host.
+        """
+        host = urlsplit(url).netloc
+
+        with self._lock:
+            if host not in self._sessions:
+                self._sessions[host] = self._new_session()
+
+            return self._sessions[host]
+
+    def get(self, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        response = self.session(url).get(url, **kwargs)
+
+        self.count(response)
+        return response
+
+    def close(self):
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+
+            self._sessions.clear()
+
+    def async_session(self):
+        """
+        New aiohttp session with the same pool parameters.
+        Should be used as async context manager.
+        """
+        aiohttp = import_aiohttp()
+
+        if isinstance(self.timeout, tuple):
+            connect_timeout, read_timeout = self.timeout
+        else:
+            connect_timeout = read_timeout = self.timeout
+
+        return aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit_per_host=self.pool_size),
+            timeout=aiohttp.ClientTimeout(
+                sock_connect=connect_timeout, sock_read=read_timeout
+            ),
+            headers=self.headers,
+        )
+
+    def _new_session(self):
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers.update(self.headers)
+
+        return session
+
+
+def _prepare_params(params):
+    """
+    aiohttp accepts only str, int and float query values,
+    convert other values like requests does.
+    """
+    if not params:
+        return None
+
+    prepared = dict()
+    for key, value in params.items():
+        if value is None:
+            continue
+
+        if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+            value = str(value)
+
+        prepared[key] = value
+
+    return prepared
+
+
+async def async_get(url, params=None, headers=None, session=None, **kwargs):
+    """
+    Send get request with aiohttp.
+
+    If ``session`` is None, temporary session will be used.
+    """
+    if session is None:
+        async with import_aiohttp().ClientSession() as session:
+            return await async_get(url, params, headers, session, **kwargs)
+
+    async with session.get(
+        url, params=_prepare_params(params), headers=headers, **kwargs
+    ) as response:
+        content = await response.read()
+
+        return Response(
+            url=str(response.url),
+            status_code=response.status,
+            headers=response.headers,
+            content=content,
+            encoding=response.charset,
+        )
@@ -0,0 +1,135 @@
+"""
+Metro stations lookup by address (find_metro) with caching.
+"""
+import json
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+
+
+# {city_id: find_metro index}, shared by all parsers in process
+_subways = dict()
+_subways_lock = threading.Lock()
+
+
+def get_city_subway(city_id):
+    """
+    find_metro index for city (e.g. 2 - Санкт-Петербург).
+
+    Index is built on first use and shared by the whole process,
+    find_metro is imported only then.
+    """
+    with _subways_lock:
+        if city_id not in _subways:
+            from find_metro.metro import get_subway_name as Subway
+
+            _subways[city_id] = Subway(city_id=city_id)
+
+        return _subways[city_id]
+
+
+@lru_cache(maxsize=10000)
+def normalize_address(address):
+    """
+    Address key for cache: case, "ё" and spaces
+    around punctuation don't matter.
+    """
+    address = address.casefold().replace("ё", "е")
+    address = re.sub(r"\s+(?=[,.;])", "", address)
+    address = re.sub(r"([,.;]+)\s*", r"\1 ", address)
+    return re.sub(r"\s+", " ", address).strip(" ,.;")
+
+
+class SubwayCache:
+    """
+    LRU cache of metro station by address.
+
+    Parameters:
+    -----------
+    lookup : callable
+        lookup(address) -> metro station name or None
+
+    maxsize : int, default 10000
+        Max number of cached addresses
+
+    path : str or Path, default None
+        Json file, from which cache is loaded (if exists)
+        and to which it is saved by SubwayCache.save()
+
+    Examples:
+    ---------
+    >>> cache = SubwayCache(Subway(city_id=2).get_subway, path="subway.json")
+    >>> cache.get("Невский пр., 1")
+    'Адмиралтейская'
+    >>> cache.save()
+    """
+
+    def __init__(self, lookup, maxsize=10000, path=None):
+        self.lookup = lookup
+        self.maxsize = maxsize
+        self.path = path
+
+        self.hits = 0
+        self.misses = 0
+
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+        if path is not None and Path(path).exists():
+            with open(path, encoding="utf-8") as file:
+                self._cache.update(json.load(file))
+
+    def get(self, address):
+        key = normalize_address(address)
+
+        with self._lock:
+            if key in self._cache:
+                self.hits += 1
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+            self.misses += 1
+
+        station = self.lookup(address)
+
+        with self._lock:
+            self._cache[key] = station
+
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+
+        return station
+
+    def save(self, path=None):
+        path = path or self.path
+        if path is None:
+            raise ValueError("'path' for subway cache required.")
+
+        with self._lock:
+            cache = dict(self._cache)
+
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(cache, file, ensure_ascii=False)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+            self.hits = self.misses = 0
+
+    @property
+    def stats(self):
+        """
+        Hits and misses counters of stations cache
+        and of normalized addresses cache.
+        """
+        normalize_info = normalize_address.cache_info()
+
+        return dict(
+            hits=self.hits,
+            misses=self.misses,
+            size=len(self._cache),
+            normalize_hits=normalize_info.hits,
+            normalize_misses=normalize_info.misses,
+        )
@@ -1,30 +1,55 @@
+import asyncio
 import re
-import requests
 import warnings
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 
 import pytz
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401 (only check that lxml is installed)
+
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
 
 from .base import BaseParser, ALL_EVENT_TAGS
+from .utils import fingerprint
 from ..emoji import add_emoji
 
 
-monthes = {
-    "января": "01",
-    "февраля": "02",
-    "марта": "03",
-    "апреля": "04",
-    "мая": "05",
-    "июня": "06",
-    "июля": "07",
-    "августа": "08",
-    "сентября": "09",
-    "октября": "10",
-    "ноября": "11",
-    "декабря": "12",
+MONTHS = {
+    "января": 1,
+    "февраля": 2,
+    "марта": 3,
+    "апреля": 4,
+    "мая": 5,
+    "июня": 6,
+    "июля": 7,
+    "августа": 8,
+    "сентября": 9,
+    "октября": 10,
+    "ноября": 11,
+    "декабря": 12,
 }
-STRPTIME = "%d %m %H:%M"
+
+# from-to datetime string on event page, e.g.:
+# - "dd month, HH:MM"
+# - "dd month, HH:MM-HH:MM"
+# - "dd month"
+# - "dd-dd month"
+# - "dd month - dd month"
+# - "dd-dd month, HH:MM-HH:MM"
+DATE_RANGE_RE = re.compile(
+    r"^(?P<day_from>\d{1,2})(?:\s+(?P<month_from>[^\W\d_]+))?"
+    r"(?:\s*[-–—]\s*(?P<day_to>\d{1,2})(?:\s+(?P<month_to>[^\W\d_]+))?)?"
+    r"(?:,?\s+(?P<time_from>\d{1,2}:\d{2})"
+    r"(?:\s*[-–—]\s*(?P<time_to>\d{1,2}:\d{2}))?)?$",
+    re.IGNORECASE,
+)
+# events, that started before scraping, are still listed by radario
+DATE_GRACE = timedelta(days=3)
 
 AVAILABLE_CATEGORIES = [
     "concert",
@@ -37,6 +62,221 @@ AVAILABLE_CATEGORIES = [
     "show",
 ]
 
+# event page nodes: field -> (tag name, attribute name, attribute value)
+EVENT_PAGE_NODES = dict(
+    adress=("span", "class", "text-secondary mt-2"),
+    category=("a", "class", "event-page__tag"),
+    date=("span", "class", "event-page__date mt-2"),
+    description=("meta", "property", "og:description"),
+    image=("img", "class", "event-page__image"),
+    place_name=("span", "class", "text-secondary mt-3"),
+    price=("button", "class", "c-button c-button--primary c-button--medium"),
+    title=("h1", "class", "event-page__title"),
+    url=("meta", "property", "og:url"),
+)
+
+# listing page is parsed only for event cards
+LISTING_STRAINER = SoupStrainer("div", {"class": "event-card"})
+
+# event page nodes required by event tags
+TAG_NODES = dict(
+    adress=("adress",),
+    category=("category",),
+    date_from=("date", "url"),
+    date_to=("date", "url"),
+    date_from_to=("date",),
+    id=("url",),
+    place_name=("place_name",),
+    post_text=("description",),
+    poster_imag=("image",),
+    price=("price",),
+    title=("title",),
+    url=("url",),
+    is_registration_open=("price",),
+)
+
+
+class EventPage:
+    """
+    Radario event page nodes, collected by single traversal of page soup.
+
+    Radario tag getters take EventPage instead of page soup
+    (Radario.parse accepts page soup too and wraps it to EventPage):
+    nodes are in EventPage.nodes (None for not found node),
+    values, that are used by several tags, are cached in EventPage.values.
+    """
+
+    __slots__ = ("nodes", "values")
+
+    def __init__(self, event_soup, fields=None):
+        """
+        Parameters:
+        -----------
+        event_soup : BeautifulSoup
+            Event page soup
+
+        fields : iterable, default None (all fields)
+            Fields from EVENT_PAGE_NODES to collect
+        """
+        fields = EVENT_PAGE_NODES if fields is None else set(fields)
+
+        # tag name -> [(field, attribute name, attribute value), ...]
+        wanted = dict()
+        for field in fields:
+            name, attr, value = EVENT_PAGE_NODES[field]
+            wanted.setdefault(name, []).append((field, attr, value))
+
+        self.nodes = dict.fromkeys(fields)
+        self.values = dict()
+        remaining = len(self.nodes)
+
+        for node in event_soup.descendants:
+            # strings have no name, so they are skipped too
+            if node.name not in wanted:
+                continue
+
+            for field, attr, value in wanted[node.name]:
+                if self.nodes[field] is None and _attr_matches(node, attr, value):
+                    self.nodes[field] = node
+                    remaining -= 1
+
+            if remaining == 0:
+                break
+
+
+def tag_nodes(tags):
+    """
+    Event page fields, required by event tags.
+    """
+    return {field for tag in tags for field in TAG_NODES.get(tag, ())}
+
+
+def event_page_strainer(fields):
+    """
+    Strainer for event page, that keeps only elements
+    (with their contents) with names of required nodes.
+    """
+    return SoupStrainer(sorted({EVENT_PAGE_NODES[field][0] for field in fields}))
+
+
+def _attr_matches(node, attr, value):
+    """
+    Match attribute like BeautifulSoup.find does:
+    multi-valued class matches by any single class or by whole value.
+    """
+    node_value = node.get(attr)
+
+    if isinstance(node_value, list):
+        return value in node_value or " ".join(node_value) == value
+
+    return node_value == value
+
+
+def parse_date_ranges(strings, reference, timezone):
+    """
+    Parse batch of from-to datetime strings (see DATE_RANGE_RE).
+
+    Year is not in strings: radario lists upcoming events, so for each
+    date range the earliest year is used, in which the event doesn't end
+    before ``reference`` datetime minus DATE_GRACE (so January events,
+    scraped in December, are in the next year, running events
+    are in the current one), date to is never before date from.
+
+    Return:
+    -------
+    (list of (datetime from, datetime to or None) or None for unparsed string,
+     list of unparsed strings)
+    """
+    results = list()
+    unparsed = list()
+
+    for string in strings:
+        try:
+            result = _parse_date_range(string, reference, timezone)
+
+        except (ValueError, KeyError):
+            result = None
+
+        if result is None:
+            unparsed.append(string)
+
+        results.append(result)
+
+    return results, unparsed
+
+
+def _parse_date_range(string, reference, timezone):
+    match = DATE_RANGE_RE.match(string.strip())
+    if match is None:
+        return None
+
+    day_from, month_from, day_to, month_to, time_from, time_to = match.groups()
+    if month_from is None and month_to is None:
+        return None
+
+    month_to = MONTHS[(month_to or month_from).lower()]
+    month_from = MONTHS[month_from.lower()] if month_from else month_to
+    hour_from, minute_from = _parse_time(time_from)
+
+    has_date_to = day_to is not None or time_to is not None
+    hour_to, minute_to = _parse_time(time_to)
+    earliest = reference - DATE_GRACE
+
+    # 29 February may be invalid for several years in a row
+    for year in range(reference.year - 1, reference.year + 5):
+        try:
+            date_from = timezone.localize(
+                datetime(year, month_from, int(day_from), hour_from, minute_from)
+            )
+            date_to = None
+
+            if has_date_to:
+                date_to = _date_to(
+                    date_from,
+                    timezone,
+                    month_to,
+                    int(day_to or day_from),
+                    hour_to,
+                    minute_to,
+                )
+
+        except ValueError:
+            continue
+
+        if (date_to or date_from) >= earliest:
+            break
+
+    else:
+        raise ValueError(f"Invalid date: {string!r}")
+
+    return date_from, date_to
+
+
+def _date_to(date_from, timezone, month, day, hour, minute):
+    """
+    Date to in the year of date from, or in the next day/year,
+    if it is before date from.
+    """
+    date_to = datetime(date_from.year, month, day, hour, minute)
+    local_date_from = date_from.replace(tzinfo=None)
+
+    if date_to < local_date_from:
+        if date_to.date() == local_date_from.date():
+            # time range after midnight, e.g. "01 января, 23:00-02:00"
+            date_to += timedelta(days=1)
+        else:
+            date_to = date_to.replace(year=date_to.year + 1)
+
+    return timezone.localize(date_to)
+
+
+def _parse_time(string):
+    if string is None:
+        return 0, 0
+
+    hour, minute = string.split(":")
+    return int(hour), int(minute)
+
 
 class Radario(BaseParser):
     name = "radario"
@@ -45,10 +285,38 @@ class Radario(BaseParser):
     DATETIME_STRF = "%Y-%m-%d"
     parser_prefix = "RADARIO-"
     TIMEZONE = pytz.timezone("Europe/Moscow")
+    MAX_WORKERS = 8  # event pages requested concurrently
+    CACHE_URL_PATTERNS = (r"radario\.ru/",)  # listing and event pages
+
+    def __init__(self, max_workers=None, html_parser=None, **kwargs):
+        """
+        Parameters:
+        -----------
+        max_workers : int, default Radario.MAX_WORKERS
+            Number of event pages requested concurrently
+
+        html_parser : str, default "lxml" if installed, else "html.parser"
+            BeautifulSoup parser for radario pages
 
-    def __init__(self):
+        Other parameters see BaseParser.
+        """
+        super().__init__(**kwargs)
         self.url = self.BASE_URL
         self.events_api = self.BASE_EVENTS_API
+        self.max_workers = max_workers or self.MAX_WORKERS
+        self.html_parser = html_parser or HTML_PARSER
+
+    def parse(self, event_data, tags=None, lazy=None):
+        """
+        Parse event page to event record with tags (see BaseParser.parse).
+
+        ``event_data`` is EventPage or event page soup (BeautifulSoup or Tag),
+        soup is wrapped to EventPage with nodes, required by tags.
+        """
+        if not isinstance(event_data, EventPage) and tags is not None:
+            event_data = EventPage(event_data, fields=tag_nodes(tags))
+
+        return super().parse(event_data, tags=tags, lazy=lazy)
 
     def get_event(self, *args, **kwargs):
         """Currently not implemented"""
@@ -76,6 +344,12 @@ class Radario(BaseParser):
             Event tags (title, id, url etc.,
             see all tags in 'escraper.ALL_EVENT_TAGS')
 
+        Event pages are requested concurrently (see Radario.max_workers),
+        events are returned in listing order. Event, which page was
+        failed to get, is skipped with warning. With state store
+        (see BaseParser) known events with unchanged listing card are skipped,
+        events are recorded to state only after all events are parsed.
+
         Examples:
         ----------
         >>> radario = Radario()
@@ -87,48 +361,194 @@ class Radario(BaseParser):
         }
         >>> radario.get_events(request_params=request_params)  # doctest: +SKIP
         """
+        tags = tags or ALL_EVENT_TAGS
+        reference = self._reference_time()
+        events = list()
+        all_event_cards = list()
+        all_event_responses = list()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for url, params in self._listing_requests(request_params):
+                response = self._request_get(url, params=params)
+                event_cards = self._event_cards(response)
+
+                event_responses = list(
+                    executor.map(
+                        self._get_event_page,
+                        [event_id for event_id, _ in event_cards],
+                    )
+                )
+                events.extend(
+                    self._events_from_responses(
+                        [
+                            event_response
+                            for event_response in event_responses
+                            if event_response is not None
+                        ],
+                        tags,
+                        reference,
+                    )
+                )
+                all_event_cards.extend(event_cards)
+                all_event_responses.extend(event_responses)
+
+        # events are recorded, only when events of all categories are parsed
+        self._remember_events(all_event_cards, all_event_responses)
+
+        return events
+
+    async def get_events_async(self, request_params=None, tags=None):
+        """
+        Async version of Radario.get_events (requires aiohttp),
+        see Radario.get_events for parameters.
+
+        All listing pages are requested concurrently,
+        then all event pages are requested concurrently.
+        Event, which page was failed to get, is skipped with warning.
+        """
+        tags = tags or ALL_EVENT_TAGS
+
+        async with self.sessions.async_session() as session:
+            listing_responses = await asyncio.gather(
+                *(
+                    self._request_get_async(url, params=params, session=session)
+                    for url, params in self._listing_requests(request_params)
+                )
+            )
+            event_cards = [
+                event_card
+                for response in listing_responses
+                for event_card in self._event_cards(response)
+            ]
+            event_ids = [event_id for event_id, _ in event_cards]
+
+            event_responses = await asyncio.gather(
+                *(
+                    self._request_get_async(self.events_api + event_id, session=session)
+                    for event_id in event_ids
+                ),
+                return_exceptions=True,
+            )
+
+        responses = list()
+        for event_id, event_response in zip(event_ids, event_responses):
+            if isinstance(event_response, Exception):
+                self._warn_failed_event_page(event_id, event_response)
+
+            elif event_response is not None:
+                responses.append(event_response)
+
+        events = self._events_from_responses(responses, tags)
+        self._remember_events(event_cards, event_responses)
+
+        return events
+
+    def _listing_requests(self, request_params=None):
+        """
+        Return list of (url, params) for events listing pages.
+        """
         request_params = (request_params or dict())
 
         if request_params.pop("online", False):
             # convert "https://spb.radario.ru/" to "https://online.radario.ru/"
             self.url = self.url.replace("spb", "online")
 
-        events = list()
-
+        requests_list = list()
         for cat in request_params.pop("category", [""]):
             if cat in AVAILABLE_CATEGORIES + [""]:
-                url = f"{self.url}{cat}"
-                response = self._request_get(url, params=request_params)
+                requests_list.append((f"{self.url}{cat}", request_params))
 
-                if response:
-                    # get only 20 events
-                    soup = BeautifulSoup(response.text, "html.parser")
-                    list_event_from_soup = soup.find_all("div", {"class": "event-card"})
+            else:
+                warnings.warn(f"Category {cat!r} is not exist", UserWarning)
 
-                else:
-                    list_event_from_soup = list()
+        return requests_list
 
-                for event_card in list_event_from_soup:
-                    event_id = event_card.find(
-                        "a", {"class": "event-card__title"}
-                    )["href"].split("/")[-1]
+    def _event_cards(self, response):
+        """
+        (event id, listing card fingerprint) from listing page
+        (only 20 events per page).
 
-                    url = self.events_api + event_id
+        With state store, known events with unchanged listing card
+        are skipped: their pages are not requested.
+        """
+        if not response:
+            return list()
 
-                    event_soup = BeautifulSoup(
-                        self._request_get(url).text, "html.parser"
-                    )
-                    events.append(self.parse(event_soup, tags=tags or ALL_EVENT_TAGS))
+        soup = BeautifulSoup(
+            response.text, self.html_parser, parse_only=LISTING_STRAINER
+        )
 
-            else:
-                warnings.warn(f"Category {cat!r} is not exist", UserWarning)
+        event_cards = list()
+        for event_card in soup.find_all("div", {"class": "event-card"}):
+            event_url = event_card.find("a", {"class": "event-card__title"})["href"]
+            event_id = event_url.split("/")[-1]
 
-        return events
+            card_fingerprint = None
+            if self.state is not None:
+                card_fingerprint = fingerprint(str(event_card))
+
+                if self.state.is_unchanged(
+                    self.parser_prefix + event_id, card_fingerprint
+                ):
+                    continue
+
+            event_cards.append((event_id, card_fingerprint))
+
+        return event_cards
 
-    def _adress(self, event_soup):
-        full_adress = event_soup.find(
-            "span", {"class": "text-secondary mt-2"}
-        ).text.strip()
+    def _remember_events(self, event_cards, event_responses):
+        """
+        Record events with received pages to state store.
+        """
+        if self.state is not None:
+            self.state.add_many(
+                (self.parser_prefix + event_id, card_fingerprint)
+                for (event_id, card_fingerprint), event_response in zip(
+                    event_cards, event_responses
+                )
+                if event_response is not None
+                and not isinstance(event_response, Exception)
+            )
+
+    def _get_event_page(self, event_id):
+        """
+        Get event page by event id.
+        Return None (with warning) if page was failed to get.
+        """
+        try:
+            return self._request_get(self.events_api + event_id)
+
+        except Exception as e:
+            self._warn_failed_event_page(event_id, e)
+            return None
+
+    def _warn_failed_event_page(self, event_id, error):
+        warnings.warn(
+            f"Failed to get event page {event_id!r}: {error!r}. Event skipped.",
+            UserWarning,
+        )
+
+    def _event_page(self, response, fields):
+        event_soup = BeautifulSoup(
+            response.text, self.html_parser, parse_only=event_page_strainer(fields)
+        )
+        return EventPage(event_soup, fields=fields)
+
+    def _events_from_responses(self, responses, tags, reference=None):
+        """
+        Parse event page responses to events, datetimes
+        of all pages are parsed by one batch.
+        """
+        fields = tag_nodes(tags)
+        event_pages = [self._event_page(response, fields) for response in responses]
+
+        if {"date_from", "date_to"} & set(tags):
+            self._parse_datetimes(event_pages, reference)
+
+        return [self.parse(event_page, tags=tags) for event_page in event_pages]
+
+    def _adress(self, event_page):
+        full_adress = event_page.nodes["adress"].text.strip()
 
         full_adress = full_adress.replace(", Центральный район", "")
 
@@ -152,152 +572,102 @@ class Radario(BaseParser):
 
         return adress
 
-    def _category(self, event_soup):
-        return event_soup.find("a", {"class": "event-page__tag"}).text.strip()
+    def _category(self, event_page):
+        return event_page.nodes["category"].text.strip()
 
-    def _datetimes_from_html(self, event_soup):
+    def _datetimes(self, event_page):
         """
-        Parse datetimes (from and to) from html page.
-        Use only in Radario._date_from()
+        Datetimes (from and to), parsed once per event page
+        (usually for all listing pages at once, see Radario._parse_datetimes).
         """
-        strfdatetime = self._date_from_to(event_soup)
-
-        day_from = None
-        month_from = None
-        hour_from = None
-        minute_from = None
-
-        day_to = None
-        month_to = None
-        hour_to = None
-        minute_to = None
-
-        # can parse from-to datetime string formats:
-        # - "dd month, HH:MM-HH:MM"
-        # - "dd month, HH:MM"
-        # - "dd-dd month"
-        if not re.match(r"^\d\d \w+,", strfdatetime) and not re.match(
-            r"^\d\d-\d\d \w+$", strfdatetime
-        ):
-            raise ValueError(
-                f"Unknown radario from-to datetime string: {strfdatetime!r}.\n"
-                f"Event url: {self._url(event_soup)}"
-            )
+        if "datetimes" not in event_page.values:
+            self._parse_datetimes([event_page])
 
-        # dd month+
-        if re.match(r"^\d\d \w+,", strfdatetime):
-            day_from = int(strfdatetime[:2])
-            month_from = int(monthes[strfdatetime[3:].split(",")[0]])
-
-            day_to = day_from
-            month_to = month_from
-
-            # dd month, HH:MM
-            if re.match(r"\d{2} \w+, \d{2}:\d{2}$", strfdatetime):
-                strtime_from = strfdatetime[-5:]
-
-                hour_from = int(strtime_from.split(":")[0])
-                minute_from = int(strtime_from.split(":")[1])
-
-            # dd month, HH:MM-HH:MM
-            elif re.match(r"\d{2} \w+,.+\d{2}:\d{2}-\d{2}:\d{2}", strfdatetime):
-                strtime_from = strfdatetime[-11:-6]
-                hour_from = int(strtime_from.split(":")[0])
-                minute_from = int(strtime_from.split(":")[1])
-
-                strtime_to = strfdatetime[-5:]
-                hour_to = int(strtime_to.split(":")[0])
-                minute_to = int(strtime_to.split(":")[1])
-
-        # dd-dd month
-        elif re.match(r"^\d\d-\d\d \w+$", strfdatetime):
-            day_from = int(strfdatetime[:2])
-            month_from = int(monthes[strfdatetime[6:]])
-            hour_from = 0
-            minute_from = 0
-
-            day_to = int(strfdatetime[3:5])
-            month_to = month_from
-            hour_to = 0
-            minute_to = 0
-
-        daytime_from = datetime.now(tz=self.TIMEZONE).replace(
-            month=month_from,
-            day=day_from,
-            hour=hour_from,
-            minute=minute_from,
-            second=0,
-            microsecond=0,
-        )
+        return event_page.values["datetimes"]
+
+    def _parse_datetimes(self, event_pages, reference=None):
+        """
+        Parse datetimes of event pages by one batch with the same
+        reference time (see parse_date_ranges). Unparsed date strings
+        are reported by single warning, their datetimes are None.
+        """
+        reference = reference or self._reference_time()
+        strings = [self._date_from_to(event_page) for event_page in event_pages]
+
+        results, unparsed = parse_date_ranges(strings, reference, self.TIMEZONE)
 
-        if hour_to is not None and minute_to is not None:
-            daytime_to = datetime.now(tz=self.TIMEZONE).replace(
-                month=month_to,
-                day=day_to,
-                hour=hour_to,
-                minute=minute_to,
-                second=0,
-                microsecond=0,
+        for event_page, result in zip(event_pages, results):
+            event_page.values["datetimes"] = result or (None, None)
+
+        if unparsed:
+            failed = "\n".join(
+                f"{string!r} (event url: {self._url(event_page)})"
+                for event_page, string, result in zip(event_pages, strings, results)
+                if result is None
+            )
+            warnings.warn(
+                f"Unknown radario from-to datetime strings:\n{failed}",
+                UserWarning,
             )
-        else:
-            daytime_to = None
 
-        return daytime_from, daytime_to
+    def _reference_time(self):
+        """
+        Current time, relative to which event year is resolved.
+        """
+        return datetime.now(tz=self.TIMEZONE)
 
-    def _date_from(self, event_soup):
-        self._date_from_, self._date_to_ = self._datetimes_from_html(event_soup)
-        return self._date_from_
+    def _date_from(self, event_page):
+        return self._datetimes(event_page)[0]
 
-    def _date_to(self, event_soup):
-        return self._date_to_
+    def _date_to(self, event_page):
+        return self._datetimes(event_page)[1]
 
-    def _date_from_to(self, event_soup):
+    def _date_from_to(self, event_page):
         """
         Parse date from and to as string from event page.
         """
         return re.sub(
             " +",
             " ",
-            event_soup.find("span", {"class": "event-page__date mt-2"})
-            .text.strip()
-            .replace("\n", " ")
+            event_page.nodes["date"].text.strip().replace("\n", " "),
         )
 
-    def _id(self, event_soup):
-        meta_url = event_soup.find("meta", property="og:url")["content"]
-        return self.parser_prefix + meta_url[meta_url.rfind("/") + 1 :]
+    def _id(self, event_page):
+        if "id" not in event_page.values:
+            meta_url = event_page.nodes["url"]["content"]
+            event_page.values["id"] = meta_url[meta_url.rfind("/") + 1 :]
 
-    def _place_name(self, event_soup):
-        return event_soup.find("span", {"class": "text-secondary mt-3"}).text.strip()
+        return self.parser_prefix + event_page.values["id"]
 
-    def _post_text(self, event_soup):
-        post_text = self.remove_html_tags(
-            event_soup.find("meta", property="og:description")["content"].replace(
-                "<br/>", "\n"
-            )
+    def _place_name(self, event_page):
+        return event_page.nodes["place_name"].text.strip()
+
+    def _post_text(self, event_page):
+        post_text = self.strip_html_tags(
+            event_page.nodes["description"]["content"].replace("<br/>", "\n")
         )
         return self.prepare_post_text(post_text)
 
-    def _poster_imag(self, event_soup):
-        event_card_image = event_soup.find("img", {"class": "event-page__image"})
+    def _poster_imag(self, event_page):
+        event_card_image = event_page.nodes["image"]
         if (
             event_card_image is not None
             and "DefaultEventImage" not in event_card_image["src"]
         ):
             return event_card_image["src"]
 
-    def _price(self, event_soup):
-        return event_soup.find(
-            "button", {"class": "c-button c-button--primary c-button--medium"}
-        ).text.strip()
+    def _price(self, event_page):
+        if "price" not in event_page.values:
+            event_page.values["price"] = event_page.nodes["price"].text.strip()
 
-    def _title(self, event_soup):
-        return add_emoji(
-            event_soup.find("h1", {"class": "event-page__title"}).text.strip()
-        )
+        return event_page.values["price"]
+
+    def _title(self, event_page):
+        return add_emoji(event_page.nodes["title"].text.strip(), rng=self.emoji_rng)
 
-    def _url(self, event_soup):
-        return self.events_api + self._id(event_soup).replace(self.parser_prefix, "")
+    def _url(self, event_page):
+        self._id(event_page)
+        return self.events_api + event_page.values["id"]
 
-    def _is_registration_open(self, event_soup):
-        return self._price(event_soup) != "Билетов нет"
+    def _is_registration_open(self, event_page):
+        return self._price(event_page) != "Билетов нет"
@@ -0,0 +1,197 @@
+"""
+Retry policy and client-side rate limiting for parsers requests.
+"""
+import asyncio
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with jitter and Retry-After support.
+
+    Parameters:
+    -----------
+    max_retries : int, default 3
+        Max number of retries after first attempt
+
+    backoff_factor : float, default 0.5
+        Delay before retry number N (from 0) is backoff_factor * 2 ** N
+
+    max_backoff : float, default 60
+        Max delay before retry in seconds (Retry-After is limited too)
+
+    jitter : bool, default True
+        Randomize delay from 0 to computed backoff ("full jitter"),
+        so concurrent requests don't retry simultaneously
+
+    retry_statuses : iterable of int, default RetryPolicy.RETRY_STATUSES
+        Response status codes, that should be retried
+    """
+
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    def __init__(
+        self,
+        max_retries=3,
+        backoff_factor=0.5,
+        max_backoff=60,
+        jitter=True,
+        retry_statuses=RETRY_STATUSES,
+    ):
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retry_statuses = frozenset(retry_statuses)
+
+    def retry_response(self, response, attempt):
+        """
+        Should bad response be retried (attempt counts from 0).
+        """
+        status_code = getattr(response, "status_code", None)
+        return attempt < self.max_retries and status_code in self.retry_statuses
+
+    def retry_exception(self, exception, attempt):
+        """
+        Should request, failed with connection error, be retried.
+        """
+        return attempt < self.max_retries
+
+    def delay(self, attempt, response=None):
+        """
+        Delay before retry in seconds.
+        Retry-After response header is preferred over backoff.
+        """
+        retry_after = get_retry_after(response)
+        if retry_after is not None:
+            return min(retry_after, self.max_backoff)
+
+        backoff = min(self.backoff_factor * 2 ** attempt, self.max_backoff)
+        if self.jitter:
+            backoff = random.uniform(0, backoff)
+
+        return backoff
+
+
+def get_retry_after(response):
+    """
+    Retry-After header value in seconds (None if header is missing or invalid).
+    """
+    headers = getattr(response, "headers", None) or dict()
+    value = headers.get("Retry-After")
+
+    if value is None:
+        return None
+
+    try:
+        return max(float(value), 0)
+
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+
+    except (TypeError, ValueError):
+        return None
+
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+
+    return max((retry_at - datetime.now(tz=timezone.utc)).total_seconds(), 0)
+
+
+class RateLimiter:
+    """
+    Token bucket: ``rate`` requests per second on average,
+    up to ``burst`` requests at once. Thread-safe.
+    """
+
+    def __init__(self, rate, burst=None):
+        if rate <= 0:
+            raise ValueError(f"Rate should be positive, got {rate!r}.")
+
+        self.rate = rate
+        self.burst = burst or max(1, rate)
+
+        self._tokens = self.burst
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self):
+        """
+        Take token and return delay before it can be used.
+        Tokens may go negative: waiting requests are queued in order.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated_at) * self.rate
+            )
+            self._updated_at = now
+            self._tokens -= 1
+
+            return max(-self._tokens / self.rate, 0)
+
+    def acquire(self):
+        time.sleep(self._reserve())
+
+    async def acquire_async(self):
+        await asyncio.sleep(self._reserve())
+
+    def pause(self, seconds):
+        """
+        Don't allow new requests for ``seconds`` (e.g. after 429 response).
+        """
+        with self._lock:
+            self._tokens = min(self._tokens, -seconds * self.rate)
+            self._updated_at = time.monotonic()
+
+
+class HostRateLimiter:
+    """
+    Rate limiters by url host.
+
+    Parameters:
+    -----------
+    limits : dict, default None
+        {host: rate} or {host: (rate, burst)}, see RateLimiter.
+        Requests to other hosts are not limited.
+
+    Examples:
+    ---------
+    >>> limiter = HostRateLimiter({"api.timepad.ru": (5, 10)})
+    >>> limiter.acquire("https://api.timepad.ru/v1/events.json")
+    """
+
+    def __init__(self, limits=None):
+        self.limiters = dict()
+
+        for host, limit in (limits or dict()).items():
+            if not isinstance(limit, tuple):
+                limit = (limit,)
+
+            self.limiters[host] = RateLimiter(*limit)
+
+    def get(self, url):
+        return self.limiters.get(urlsplit(url).netloc)
+
+    def acquire(self, url):
+        limiter = self.get(url)
+        if limiter is not None:
+            limiter.acquire()
+
+    async def acquire_async(self, url):
+        limiter = self.get(url)
+        if limiter is not None:
+            await limiter.acquire_async()
+
+    def pause(self, url, seconds):
+        limiter = self.get(url)
+        if limiter is not None:
+            limiter.pause(seconds)
@@ -0,0 +1,104 @@
+"""
+Persistent state of produced events for incremental crawling.
+"""
+import sqlite3
+import threading
+import time
+
+
+class StateStore:
+    """
+    Seen events in sqlite database file: event id (TIMEPAD-..., RADARIO-...)
+    with content fingerprint (see escraper.parsers.utils.fingerprint),
+    and high-water marks of sources.
+
+    Parsers with state store skip known events with unchanged fingerprint
+    (and don't request or parse them), produced events are recorded.
+
+    Parameters:
+    -----------
+    path : str or Path
+        State database file (created if doesn't exist)
+
+    Examples:
+    ---------
+    >>> state = StateStore("escraper_state.sqlite")
+    >>> timepad = Timepad(state=state)
+    >>> timepad.get_events(request_params)  # all events
+    >>> timepad.get_events(request_params)  # only new and changed events
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS events (
+                id TEXT PRIMARY KEY,
+                fingerprint TEXT,
+                seen_at REAL
+            )
+            """
+        )
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS marks (name TEXT PRIMARY KEY, value TEXT)"
+        )
+        self._connection.commit()
+
+    def is_unchanged(self, event_id, fingerprint):
+        """
+        Is event known with the same fingerprint.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT fingerprint FROM events WHERE id = ?", (event_id,)
+            ).fetchone()
+
+        return row is not None and row[0] == fingerprint
+
+    def add(self, event_id, fingerprint):
+        self.add_many([(event_id, fingerprint)])
+
+    def add_many(self, events):
+        """
+        Record events: iterable of (event id, fingerprint).
+        """
+        now = time.time()
+
+        with self._lock:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO events VALUES (?, ?, ?)",
+                ((event_id, fp, now) for event_id, fp in events),
+            )
+            self._connection.commit()
+
+    def get_mark(self, name, default=None):
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value FROM marks WHERE name = ?", (name,)
+            ).fetchone()
+
+        return default if row is None else row[0]
+
+    def set_mark(self, name, value):
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO marks VALUES (?, ?)", (name, value)
+            )
+            self._connection.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+
+    def clear(self):
+        with self._lock:
+            self._connection.execute("DELETE FROM events")
+            self._connection.execute("DELETE FROM marks")
+            self._connection.commit()
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
@@ -1,14 +1,18 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+import json
 import os
 import itertools
 import re
+import threading
+import time
 from pathlib import Path
 
-from find_metro.metro import get_subway_name as Subway
 import pytz
 
 from .base import BaseParser, ALL_EVENT_TAGS
-from .utils import STRPTIME
+from .metro import SubwayCache, get_city_subway
+from .utils import STRPTIME, fingerprint
 from ..emoji import add_emoji
 
 
@@ -34,10 +38,20 @@ class Timepad(BaseParser):
     name = "timepad"
     url = "www.timepad.ru"
     events_api = "https://api.timepad.ru/v1/events"
+    PAGE_SIZE = 100  # max limit in timepad request parameters
+    CACHE_URL_PATTERNS = (r"/v1/dictionary/",)
+    DICTIONARY_API = "https://api.timepad.ru/v1/dictionary/"
+    DICTIONARIES = ("event_categories", "event_statuses", "tickets_statuses")
+    DICTIONARY_TTL = 24 * 60 * 60  # seconds
+    CITY_ID = 2  # find_metro city id: 2 - Санкт-Петербург
+    CREATED_AT_MARK = "timepad.created_at"  # state store high-water mark prefix
+    # request parameters, that don't change set of requested events (for mark)
+    MARK_IGNORED_PARAMS = ("limit", "skip", "created_at_min", "fields")
     parser_prefix = "TIMEPAD-"
     TIMEZONE = pytz.timezone("Europe/Moscow")
     FIELDS = (  # event fields in timepad request parameters
         "name",
+        "created_at",
         "starts_at",
         "organization",
         "description_short",
@@ -52,7 +66,36 @@ class Timepad(BaseParser):
         "categories",
     )
 
-    def __init__(self, token=None):
+    def __init__(
+        self,
+        token=None,
+        dictionary_ttl=None,
+        city_id=None,
+        subway_cache=None,
+        **kwargs,
+    ):
+        """
+        Parameters:
+        -----------
+        token : str, default None
+            Timepad token (default from environ variable TIMEPAD_TOKEN)
+
+        dictionary_ttl : float, default Timepad.DICTIONARY_TTL
+            Seconds, while loaded dictionaries (event_categories etc.)
+            are used without new request
+
+        city_id : int, default Timepad.CITY_ID
+            find_metro city id for metro stations lookup
+
+        subway_cache : escraper.parsers.metro.SubwayCache or path, default None
+            Cache of metro stations by address. Path means cache,
+            that is loaded from and saved to json file
+            (see Timepad.subway_cache.save). By default in-memory cache.
+
+        Other parameters see BaseParser.
+        """
+        super().__init__(**kwargs)
+
         if token is None:
             if "TIMEPAD_TOKEN" in os.environ:
                 token = os.environ.get("TIMEPAD_TOKEN")
@@ -62,17 +105,51 @@ class Timepad(BaseParser):
 
         self._token = token
         self.headers = dict(Authorization=f"Bearer {self._token}")
-        self.city_subway = Subway(city_id=2)  # 2 - Санкт петербург
+        self.dictionary_ttl = (
+            self.DICTIONARY_TTL if dictionary_ttl is None else dictionary_ttl
+        )
+        self.city_id = city_id or self.CITY_ID
+
+        if not isinstance(subway_cache, SubwayCache):
+            subway_cache = SubwayCache(self._get_subway, path=subway_cache)
+        self.subway_cache = subway_cache
+
+    @property
+    def city_subway(self):
+        """
+        find_metro index for Timepad.city_id (built on first use).
+        """
+        return get_city_subway(self.city_id)
+
+    def _get_subway(self, address):
+        return self.city_subway.get_subway(address)
 
     def get_event(self, event_id=None, event_url=None, tags=None):
+        url = self._event_request(event_id, event_url)
+        response = self._request_get(url, headers=self.headers)
+
+        return self._event_from_response(response, tags)
+
+    async def get_event_async(self, event_id=None, event_url=None, tags=None):
+        """
+        Async version of Timepad.get_event (requires aiohttp).
+        """
+        url = self._event_request(event_id, event_url)
+        response = await self._request_get_async(url, headers=self.headers)
+
+        return self._event_from_response(response, tags)
+
+    def _event_request(self, event_id=None, event_url=None):
         if event_url is not None:
             event_id = re.findall(r"(?<=event/)\d*(?=/)", event_url)[0]
 
         if event_id is None:
             raise ValueError("'event_id' or 'event_url' required.")
 
-        url = self.events_api + f"/{event_id}"
-        response_json = self._request_get(url, headers=self.headers).json()
+        return self.events_api + f"/{event_id}"
+
+    def _event_from_response(self, response, tags=None):
+        response_json = response.json()
 
         if not is_moderated(response_json):
             print("Event is not moderated")
@@ -134,6 +211,11 @@ class Timepad(BaseParser):
             Event tags (title, id, url etc.,
             see all tags in 'escraper.ALL_EVENT_TAGS')
 
+        With state store (see BaseParser) known unchanged events are skipped,
+        and created_at_min is by default max created_at of the last complete
+        crawl with the same request parameters and sort="created_at"
+        (all events in response or Timepad.iter_events until the end).
+
         Examples:
         ---------
         >>> tp = Timepad()
@@ -159,24 +241,218 @@ class Timepad(BaseParser):
         >>> params = dict(starts_at_min="2020-08-11T00:00:00")
         <10 events after that starts after "2020-08-11T00:00:00">
         """
-        request_params = request_params or {}
+        url, request_params, mark = self._events_request(request_params)
+        res = self._request_get(url, params=request_params, headers=self.headers)
+
+        return self._events_from_response(res, tags, request_params, mark)
+
+    async def get_events_async(self, request_params=None, tags=None):
+        """
+        Async version of Timepad.get_events (requires aiohttp),
+        see Timepad.get_events for parameters.
+
+        Examples:
+        ---------
+        >>> tp = Timepad()
+        >>> params = dict(cities="Санкт-Петербург")
+        >>> asyncio.run(tp.get_events_async(request_params=params))
+        <list of 10 events from Санкт-Петербург>
+        """
+        url, request_params, mark = self._events_request(request_params)
+        res = await self._request_get_async(
+            url, params=request_params, headers=self.headers
+        )
+
+        return self._events_from_response(res, tags, request_params, mark)
+
+    def _events_request(self, request_params=None):
+        """
+        Return events url, request parameters and state store
+        created_at mark name for parameters (None without state store).
+        Request parameters are a copy: caller's parameters are not changed.
+        """
+        request_params = dict(request_params or {})
         if "fields" not in request_params:
             request_params["fields"] = ", ".join(self.FIELDS)
 
+        mark = None
+        if self.state is not None:
+            mark = self._created_at_mark(request_params)
+
+            if "created_at_min" not in request_params:
+                # only events created after last complete crawl
+                created_at_min = self.state.get_mark(mark)
+                if created_at_min is not None:
+                    request_params["created_at_min"] = created_at_min
+
+        return self.events_api + ".json", request_params, mark
+
+    def _created_at_mark(self, request_params):
+        """
+        State store mark name for request parameters: marks of different
+        queries (cities, categories etc.) are independent, page
+        and created_at_min parameters don't change mark.
+        """
+        params = {
+            name: re.sub(r"\s*,\s*", ",", str(value).strip())
+            for name, value in request_params.items()
+            if name not in self.MARK_IGNORED_PARAMS
+        }
+        return f"{self.CREATED_AT_MARK}:{fingerprint(params)}"
+
+    def iter_events(self, request_params=None, tags=None):
+        """
+        Iterate over all events by request parameters.
+
+        Pages are requested by 'skip' and 'limit' parameters
+        automatically, until events run out. Next page is requested
+        in background, while current page is parsed.
+
+        Parameters:
+        -----------
+        request_params : dict, default None
+            Parameters for timepad events, see Timepad.get_events.
+            'limit' is used as page size (default Timepad.PAGE_SIZE),
+            'skip' is used as start position (default 0).
+
+        tags : list of tags, default all available event tags
+            Event tags (title, id, url etc.,
+            see all tags in 'escraper.ALL_EVENT_TAGS')
+
+        Yields:
+        -------
+        event namedtuple (None for not moderated event,
+        same as Timepad.get_events)
+
+        Examples:
+        ---------
+        >>> tp = Timepad()
+        >>> params = dict(cities="Санкт-Петербург")
+        >>> for event in tp.iter_events(request_params=params):
+        ...     print(event.title)
+        """
+        url, request_params, mark = self._events_request(request_params)
+        limit = min(int(request_params.pop("limit", self.PAGE_SIZE)), self.PAGE_SIZE)
+        skip = int(request_params.pop("skip", 0))
+        complete = skip == 0
+        created_at = list()
+        seen = list()
+
+        def get_page(skip):
+            params = dict(request_params, limit=limit, skip=skip)
+            return self._request_get(url, params=params, headers=self.headers)
+
+        try:
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                next_page = executor.submit(get_page, skip)
+
+                while next_page is not None:
+                    res = next_page.result()
+                    next_page = None
+
+                    if not res:
+                        complete = False
+                        break
+
+                    response_json = res.json()
+                    values = response_json["values"]
+                    skip += limit
+
+                    total = response_json.get("total")
+                    if len(values) == limit and (total is None or skip < total):
+                        next_page = executor.submit(get_page, skip)
+
+                    if mark is not None:
+                        created_at.extend(event_created_at(values))
+
+                    yield from self._parse_values(values, tags, seen)
+
+            # not reached, if iteration is stopped by consumer or error
+            if complete and mark is not None:
+                self._update_created_at_mark(mark, request_params, created_at)
+
+        finally:
+            # only events, that were yielded to consumer
+            self._remember_events(seen)
+
+    def _events_from_response(self, res, tags=None, request_params=None, mark=None):
+        if not res:
+            return list()
+
+        response_json = res.json()
+        values = response_json["values"]
+        seen = list()
+        events = list(self._parse_values(values, tags, seen))
+
+        # events are recorded, only when all of them are parsed
+        self._remember_events(seen)
+
+        if mark is not None and is_complete_response(request_params, response_json):
+            self._update_created_at_mark(
+                mark, request_params, list(event_created_at(values))
+            )
+
+        return events
+
+    def _parse_values(self, values, tags=None, seen=None):
+        """
+        Parse events json values.
+
+        With state store, known unchanged events are skipped,
+        (event id, fingerprint) of parsed event is appended to ``seen``
+        before event is yielded (record them with Timepad._remember_events,
+        when caller got events).
+        """
         tags = tags or ALL_EVENT_TAGS
 
-        url = self.events_api + ".json"
-        res = self._request_get(url, params=request_params, headers=self.headers)
+        for response_json in values:
+            if not is_moderated(response_json):
+                yield None
+                continue
 
-        events_data = list()
-        if res:
-            for response_json in res.json()["values"]:
-                if is_moderated(response_json):
-                    events_data.append(self.parse(response_json, tags=tags))
-                else:
-                    events_data.append(None)
+            if self.state is None:
+                yield self.parse(response_json, tags=tags)
+                continue
+
+            event_id = self._id(response_json)
+            event_fingerprint = fingerprint(response_json)
+
+            if self.state.is_unchanged(event_id, event_fingerprint):
+                continue
+
+            event = self.parse(response_json, tags=tags)
+
+            if seen is not None:
+                seen.append((event_id, event_fingerprint))
+
+            yield event
+
+    def _remember_events(self, seen):
+        """
+        Record (event id, fingerprint) of events to state store.
+        """
+        if seen:
+            self.state.add_many(seen)
+
+    def _update_created_at_mark(self, mark, request_params, created_at):
+        """
+        Save max event created_at of complete crawl as high-water mark
+        in state store. Mark is saved only for crawl sorted by created_at:
+        otherwise event, created during crawl, may get to already
+        requested page, and it wouldn't be requested again.
+        """
+        if request_params.get("sort") != "created_at":
+            return
+
+        previous = self.state.get_mark(mark)
+        if previous is not None:
+            created_at.append(previous)
 
-        return events_data
+        if created_at:
+            self.state.set_mark(
+                mark,
+                max(created_at, key=lambda value: datetime.strptime(value, STRPTIME)),
+            )
 
     def _adress(self, event):
         if "city" not in event["location"]:
@@ -202,11 +478,11 @@ class Timepad(BaseParser):
 
             else:
                 address = event["location"]["address"].strip()
-                metro_station = self.city_subway.get_subway(address)
+                metro_station = self.subway_cache.get(address)
                 if metro_station is not None:
                     address = f"{address}, м.{metro_station}"
 
-        return self.remove_html_tags(address)
+        return self.strip_html_tags(address)
 
     def _category(self, event):
         """
@@ -235,16 +511,16 @@ class Timepad(BaseParser):
         return self.parser_prefix + str(event["id"])
 
     def _place_name(self, event):
-        return self.remove_html_tags(event["organization"]["name"]).strip()
+        return self.strip_html_tags(event["organization"]["name"]).strip()
 
     def _post_text(self, event):
         post_text = ""
 
         if event.get("description_short"):
-            post_text = self.remove_html_tags(event["description_short"])
+            post_text = self.strip_html_tags(event["description_short"])
 
         elif event.get("description_html"):
-            post_text = self.remove_html_tags(event["description_html"])
+            post_text = self.strip_html_tags(event["description_html"])
 
         else:
             post_text = ""
@@ -280,7 +556,7 @@ class Timepad(BaseParser):
         return price_text
 
     def _title(self, event):
-        return add_emoji(self.remove_html_tags(event["name"]))
+        return add_emoji(self.strip_html_tags(event["name"]), rng=self.emoji_rng)
 
     def _url(self, event):
         return event["url"]
@@ -306,8 +582,7 @@ class Timepad(BaseParser):
             ...
         ]
         """
-        url = "https://api.timepad.ru/v1/dictionary/event_categories"
-        return self._request_get(url, headers=self.headers).json()["values"]
+        return self.get_dictionary("event_categories")
 
     @property
     def event_statuses(self):
@@ -326,8 +601,7 @@ class Timepad(BaseParser):
             {'id': 'inactive', 'name': 'Неактивна'}
         ]
         """
-        url = "https://api.timepad.ru/v1/dictionary/event_statuses"
-        return self._request_get(url, headers=self.headers).json()["values"]
+        return self.get_dictionary("event_statuses")
 
     @property
     def tickets_statuses(self):
@@ -347,9 +621,98 @@ class Timepad(BaseParser):
             ...
         ]
         """
-        url = "https://api.timepad.ru/v1/dictionary/tickets_statuses"
-        return self._request_get(url, headers=self.headers).json()["values"]
+        return self.get_dictionary("tickets_statuses")
+
+    def get_dictionary(self, name):
+        """
+        Getting timepad dictionary (see Timepad.DICTIONARIES).
+
+        Dictionaries are shared by all Timepad instances and
+        requested again only after Timepad.dictionary_ttl seconds
+        (or after Timepad.invalidate_dictionaries).
+        """
+        with _dictionaries_lock:
+            cached = _dictionaries.get(name)
+
+        if cached is not None:
+            loaded_at, values = cached
+            # dictionaries from snapshot have no loaded_at and never expire
+            if loaded_at is None or time.time() - loaded_at < self.dictionary_ttl:
+                return values
+
+        url = self.DICTIONARY_API + name
+        values = self._request_get(url, headers=self.headers).json()["values"]
+
+        with _dictionaries_lock:
+            _dictionaries[name] = (time.time(), values)
+
+        return values
+
+    @staticmethod
+    def invalidate_dictionaries(name=None):
+        """
+        Remove loaded dictionary by name (all dictionaries if name is None).
+        """
+        with _dictionaries_lock:
+            if name is None:
+                _dictionaries.clear()
+            else:
+                _dictionaries.pop(name, None)
+
+    @staticmethod
+    def load_dictionaries(path):
+        """
+        Load dictionaries from json snapshot (see Timepad.save_dictionaries).
+        Loaded dictionaries don't expire, so they can be used offline.
+        """
+        with open(path, encoding="utf-8") as file:
+            snapshot = json.load(file)
+
+        with _dictionaries_lock:
+            for name, values in snapshot.items():
+                _dictionaries[name] = (None, values)
+
+    def save_dictionaries(self, path):
+        """
+        Save all dictionaries to json snapshot.
+
+        Example:
+        --------
+        >>> Timepad().save_dictionaries("timepad_dictionaries.json")
+
+        Later, without network:
+        >>> Timepad.load_dictionaries("timepad_dictionaries.json")
+        >>> Timepad().event_categories
+        """
+        snapshot = {name: self.get_dictionary(name) for name in self.DICTIONARIES}
+
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(snapshot, file, ensure_ascii=False, indent=2)
+
+
+# {name: (loaded_at, values)}, shared by all Timepad instances
+_dictionaries = dict()
+_dictionaries_lock = threading.Lock()
 
 
 def is_moderated(response_json):
     return response_json["moderation_status"] != "not_moderated"
+
+
+def event_created_at(values):
+    return (value["created_at"] for value in values if "created_at" in value)
+
+
+def is_complete_response(request_params, response_json):
+    """
+    Are all events by request parameters in single response.
+    """
+    if int(request_params.get("skip", 0)):
+        return False
+
+    total = response_json.get("total")
+    if total is not None:
+        return len(response_json["values"]) >= total
+
+    # timepad default limit is 10
+    return len(response_json["values"]) < int(request_params.get("limit", 10))
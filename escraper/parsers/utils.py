@@ -1 +1,195 @@
+import hashlib
+import json
+import re
+from functools import partial
+from html import unescape
+from html.entities import html5
+
+
 STRPTIME = "%Y-%m-%dT%H:%M:%S%z"
+
+ALL_EVENT_TAGS = (
+    "adress",
+    "category",
+    "date_from",
+    "date_to",
+    "date_from_to",
+    "id",
+    "place_name",
+    "post_text",
+    "poster_imag",
+    "price",
+    "title",
+    "url",
+    "is_registration_open",
+)
+
+# markup, that html.parser doesn't return as text:
+# script, style and template elements with contents (not text for get_text),
+# CDATA sections (only content is text), comments, declarations (<!DOCTYPE ...>),
+# processing instructions, end tags, start tags (attribute values may contain ">")
+HTML_MARKUP_RE = re.compile(
+    r"<(?P<raw>(?i:script|style|template))\b(?:\"[^\"]*\"|'[^']*'|[^'\">])*(?<!/)>"
+    r".*?(?:</(?i:(?P=raw))\s*>|\Z)"
+    r"|<!\[CDATA\[(?P<cdata>.*?)\]\]>"
+    r"|<!--.*?-->"
+    r"|<![^>]*>"
+    r"|<\?[^>]*>"
+    r"|</[^>]*>"
+    r"|<[a-zA-Z](?:\"[^\"]*\"|'[^']*'|[^'\">])*>",
+    re.DOTALL,
+)
+SENTENCE_END_RE = re.compile(r"[.!?…]")
+MARKUP_PLACEHOLDER = "\x00"
+# html whitespace: text of only these characters is collapsed by BeautifulSoup
+HTML_WHITESPACE = "\t\n\f\r "
+# whitespace-only text after markup (markup is replaced with placeholder)
+BLANK_TEXT_RE = re.compile(r"\x00([\t\n\f\r ]+)(?=\x00|\Z)")
+# tags, in which whitespace is kept as is
+PRESERVE_WHITESPACE_TAGS = ("pre", "textarea")
+TAG_NAME_RE = re.compile(r"<(/?)([a-zA-Z][^\t\n\f\r />]*)")
+# markup, that is stripped segment by segment
+SEGMENTS_MARKUP_RE = re.compile(r"<(?:!\[CDATA\[|(?i:pre|textarea)[\t\n\f\r />])")
+HTML_ENTITY_RE = re.compile(r"&(#[xX][0-9a-fA-F]+|#[0-9]+|[a-zA-Z][-.a-zA-Z0-9]*)(;?)")
+
+
+def _replace_entity(match, at_end=True):
+    name, semicolon = match.groups()
+
+    if not semicolon and at_end and match.end() == len(match.string):
+        # incomplete entity at the end of data is kept as is
+        return match.group()
+
+    if name.startswith("#"):
+        return unescape(f"&{name};")
+
+    character = html5.get(name + ";")
+    if character is None:
+        # BeautifulSoup keeps unknown entity without semicolon
+        return "&" + name
+
+    return character
+
+
+def _replace_entities(text, at_end=True):
+    """
+    Replace entities in text between markup
+    (``at_end`` - text is at the end of data).
+    """
+    if "&" not in text:
+        return text
+
+    return HTML_ENTITY_RE.sub(partial(_replace_entity, at_end=at_end), text)
+
+
+def strip_html_tags(data):
+    """
+    Remove html markup and replace entities without building soup.
+
+    Return the same text as BeautifulSoup(data, "html.parser").get_text()
+    for markup in events descriptions (<br> is removed, not replaced,
+    script and style contents are removed, whitespace-only text between
+    markup is collapsed to one newline or space, except in pre and textarea).
+    """
+    if "<" not in data:
+        return _collapse_whitespace(_replace_entities(data))
+
+    if MARKUP_PLACEHOLDER in data or SEGMENTS_MARKUP_RE.search(data) is not None:
+        return _strip_html_segments(data)
+
+    # markup is replaced with placeholder before entities, so entities
+    # are not joined across removed tags and entity before tag
+    # is not at the end of data
+    text = _replace_entities(HTML_MARKUP_RE.sub(MARKUP_PLACEHOLDER, data))
+    # placeholder at the start: text before first markup is collapsed too
+    text = BLANK_TEXT_RE.sub(_collapse_blank_text, MARKUP_PLACEHOLDER + text)
+
+    return text.replace(MARKUP_PLACEHOLDER, "")
+
+
+def _strip_html_segments(data):
+    """
+    Strip markup segment by segment (CDATA content is not
+    entity-replaced, whitespace in pre and textarea is kept).
+    """
+    texts = list()
+    position = 0
+    open_tags = list()
+    preserved = 0  # open pre and textarea tags
+
+    def add_text(text):
+        texts.append(text if preserved else _collapse_whitespace(text))
+
+    for match in HTML_MARKUP_RE.finditer(data):
+        add_text(_replace_entities(data[position : match.start()], at_end=False))
+        position = match.end()
+
+        if match.group("cdata") is not None:
+            add_text(match.group("cdata"))
+
+        tag = TAG_NAME_RE.match(match.group())
+        if tag is None or match.group("raw") is not None:
+            continue
+
+        end_tag, name = tag.group(1), tag.group(2).lower()
+
+        if end_tag:
+            if name in open_tags:
+                # end tag also closes tags, opened after the same tag
+                while True:
+                    closed = open_tags.pop()
+                    preserved -= closed in PRESERVE_WHITESPACE_TAGS
+
+                    if closed == name:
+                        break
+
+        elif not match.group().endswith("/>"):
+            open_tags.append(name)
+            preserved += name in PRESERVE_WHITESPACE_TAGS
+
+    add_text(_replace_entities(data[position:]))
+
+    return "".join(texts)
+
+
+def _collapse_whitespace(text):
+    """
+    Whitespace-only text is replaced with newline (if it has one)
+    or space, other text is returned as is.
+    """
+    if not text or text.strip(HTML_WHITESPACE):
+        return text
+
+    return "\n" if "\n" in text else " "
+
+
+def _collapse_blank_text(match):
+    return _collapse_whitespace(match.group(1))
+
+
+def truncate_text(text, max_length=550, min_length=365):
+    """
+    Cut text longer than ``max_length`` after first sentence end
+    (".", "!", "?" or "…"), that gives at least ``min_length`` characters.
+    Text is returned as is, if there is no such sentence end.
+
+    Text is scanned only from ``min_length`` to that sentence end.
+    """
+    if len(text) <= max_length:
+        return text
+
+    match = SENTENCE_END_RE.search(text, min_length - 1)
+    if match is None:
+        return text
+
+    return text[: match.end()]
+
+
+def fingerprint(data):
+    """
+    Content fingerprint of event data (str or json-serializable value).
+    """
+    if not isinstance(data, str):
+        data = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+
+    return hashlib.blake2b(data.encode(), digest_size=16).hexdigest()
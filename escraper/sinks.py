@@ -0,0 +1,246 @@
+"""
+Streaming writers of events to JSONL, CSV and Parquet files.
+
+Events are written by batches, so memory doesn't depend
+on number of events (e.g. for Timepad.iter_events or escraper.crawl).
+"""
+import csv
+import json
+from abc import ABC, abstractmethod
+from datetime import datetime
+from pathlib import Path
+
+
+# event tags, that are not strings (for Parquet schema)
+DATETIME_TAGS = ("date_from", "date_to")
+BOOL_TAGS = ("is_registration_open",)
+
+
+def event_to_dict(event):
+    """
+    Event record (namedtuple or LazyEvent) as dict,
+    SourceEvent (see escraper.crawl) as event dict with "source" key.
+    """
+    if getattr(event, "_fields", None) == ("source", "event"):
+        return dict(source=event.source, **event_to_dict(event.event))
+
+    return event._asdict()
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class EventSink(ABC):
+    """
+    Base streaming writer: events are buffered
+    and written by batches of ``batch_size`` events.
+
+    Parameters:
+    -----------
+    path : str or Path
+        Output file
+
+    batch_size : int, default 1000
+        Number of events in memory before writing
+
+    Examples:
+    ---------
+    >>> with JsonlSink("events.jsonl") as sink:
+    ...     sink.write_many(timepad.iter_events(request_params))
+    """
+
+    def __init__(self, path, batch_size=1000):
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.count = 0
+
+        self._batch = list()
+        self._closed = False
+
+    def write(self, event):
+        """
+        Write event (None events are skipped).
+        """
+        if event is None:
+            return
+
+        self._batch.append(event_to_dict(event))
+        self.count += 1
+
+        if len(self._batch) >= self.batch_size:
+            self.flush()
+
+    def write_many(self, events):
+        for event in events:
+            self.write(event)
+
+    def flush(self):
+        if self._batch:
+            self._write_batch(self._batch)
+            self._batch = list()
+
+    def close(self):
+        if not self._closed:
+            self.flush()
+            self._close()
+            self._closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @abstractmethod
+    def _write_batch(self, batch):
+        """Write list of event dicts"""
+
+    def _close(self):
+        pass
+
+
+class JsonlSink(EventSink):
+    """
+    Events as json lines, datetimes in ISO 8601 format.
+    """
+
+    def __init__(self, path, batch_size=1000):
+        super().__init__(path, batch_size)
+        self._file = open(self.path, "w", encoding="utf-8")
+
+    def _write_batch(self, batch):
+        self._file.writelines(
+            json.dumps(row, ensure_ascii=False, default=_json_default) + "\n"
+            for row in batch
+        )
+
+    def _close(self):
+        self._file.close()
+
+
+class CsvSink(EventSink):
+    """
+    Events as csv rows with header (columns by first event),
+    datetimes in ISO 8601 format.
+    """
+
+    def __init__(self, path, batch_size=1000):
+        super().__init__(path, batch_size)
+        self._file = open(self.path, "w", encoding="utf-8", newline="")
+        self._writer = None
+
+    def _write_batch(self, batch):
+        if self._writer is None:
+            self._writer = csv.DictWriter(self._file, fieldnames=list(batch[0]))
+            self._writer.writeheader()
+
+        self._writer.writerows(
+            {
+                key: value.isoformat() if isinstance(value, datetime) else value
+                for key, value in row.items()
+            }
+            for row in batch
+        )
+
+    def _close(self):
+        self._file.close()
+
+
+class ParquetSink(EventSink):
+    """
+    Events as Parquet file (requires pyarrow), each batch is row group.
+    Datetimes are timestamps in UTC, is_registration_open is bool,
+    other columns are strings.
+    """
+
+    def __init__(self, path, batch_size=1000):
+        super().__init__(path, batch_size)
+        self._pyarrow = import_pyarrow()
+        self._writer = None
+
+    def _schema(self, columns):
+        pa = self._pyarrow
+
+        types = dict.fromkeys(columns, pa.string())
+        types.update(
+            (column, pa.timestamp("us", tz="UTC"))
+            for column in DATETIME_TAGS
+            if column in types
+        )
+        types.update((column, pa.bool_()) for column in BOOL_TAGS if column in types)
+
+        return pa.schema(list(types.items()))
+
+    def _write_batch(self, batch):
+        import pyarrow.parquet as pq
+
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(str(self.path), self._schema(batch[0]))
+
+        columns = {
+            name: [row.get(name) for row in batch] for name in self._writer.schema.names
+        }
+        for name in BOOL_TAGS:
+            # e.g. Timepad is_registration_open is int
+            if name in columns:
+                columns[name] = [
+                    None if value is None else bool(value) for value in columns[name]
+                ]
+
+        table = self._pyarrow.Table.from_pydict(columns, schema=self._writer.schema)
+        self._writer.write_table(table)
+
+    def _close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+SINKS = dict(jsonl=JsonlSink, csv=CsvSink, parquet=ParquetSink)
+
+
+def open_sink(path, format=None, batch_size=1000):
+    """
+    Sink by format: "jsonl", "csv" or "parquet"
+    (default by path extension).
+    """
+    format = format or Path(path).suffix.lstrip(".").lower()
+
+    if format not in SINKS:
+        raise ValueError(
+            f"Unknown events format {format!r}, available formats: {list(SINKS)}."
+        )
+
+    return SINKS[format](path, batch_size=batch_size)
+
+
+def write_events(events, path, format=None, batch_size=1000):
+    """
+    Write events to file (see open_sink), return number of written events.
+
+    Examples:
+    ---------
+    >>> write_events(timepad.iter_events(request_params), "events.parquet")
+    """
+    with open_sink(path, format=format, batch_size=batch_size) as sink:
+        sink.write_many(events)
+
+    return sink.count
+
+
+def import_pyarrow():
+    """
+    Import pyarrow on first Parquet sink (it is optional).
+    """
+    try:
+        import pyarrow
+
+    except ImportError:
+        raise ImportError(
+            "Parquet output requires pyarrow: pip install escraper[parquet]"
+        ) from None
+
+    return pyarrow
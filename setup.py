@@ -8,6 +8,13 @@ setuptools.setup(
     name="escraper",
     version="1.1.1",
     packages=setuptools.find_packages(),
+    python_requires=">=3.7",
     install_requires=install_requires,
+    extras_require={
+        "async": ["aiohttp"],
+        "lxml": ["lxml"],
+        "parquet": ["pyarrow"],
+    },
+    entry_points={"console_scripts": ["escraper=escraper.cli:main"]},
     include_package_data=True,
 )
@@ -0,0 +1,45 @@
+import importlib.util
+import os
+from pathlib import Path
+
+import pytest
+
+
+SUITE = Path(__file__).parent.parent / "benchmarks" / "suite.py"
+
+
+@pytest.fixture
+def suite():
+    spec = importlib.util.spec_from_file_location("benchmarks_suite", SUITE)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    return module
+
+
+#######################################
+## benchmarks regression check
+#######################################
+@pytest.mark.skipif(
+    not os.environ.get("ESCRAPER_BENCHMARK"),
+    reason="benchmarks are slow: set ESCRAPER_BENCHMARK=1 to run",
+)
+def test_benchmarks_no_regression(suite):
+    results = suite.run()
+
+    assert suite.compare(results, suite.load_baseline()) == []
+
+
+def test_benchmarks_compare(suite, capsys):
+    baseline = dict(
+        same=dict(us=10, relative=1.0),
+        slower=dict(us=10, relative=1.0),
+    )
+    results = dict(
+        same=dict(us=10, relative=1.2),
+        slower=dict(us=20, relative=2.0),
+        new=dict(us=1, relative=0.1),
+    )
+
+    assert suite.compare(results, baseline, threshold=0.5) == ["slower"]
+    assert "REGRESSION" in capsys.readouterr().out
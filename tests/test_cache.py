@@ -0,0 +1,129 @@
+import time
+
+import pytest
+import requests
+
+from escraper.parsers import Radario
+from escraper.parsers.cache import HttpCache
+from escraper.parsers.http import Response
+
+
+class Server:
+    """
+    Fake server with ETag support, count requests.
+    """
+
+    def __init__(self, content=b"test content", etag='"1"'):
+        self.content = content
+        self.etag = etag
+        self.requests = list()
+
+    def get(self, url, params=None, headers=None, **kwargs):
+        self.requests.append((url, params, dict(headers or {})))
+
+        if headers and headers.get("If-None-Match") == self.etag:
+            return Response(url, 304, headers={"ETag": self.etag})
+
+        return Response(url, 200, headers={"ETag": self.etag}, content=self.content)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return HttpCache(tmp_path / "cache.sqlite")
+
+
+#######################################
+## cache HttpCache
+#######################################
+def test_cache_not_modified(cache):
+    server = Server()
+
+    first = cache.get(server.get, "https://radario.ru/events/1")
+    second = cache.get(server.get, "https://radario.ru/events/1")
+
+    assert first.content == second.content == b"test content"
+    assert second.status_code == 200
+    assert server.requests[1][2] == {"If-None-Match": '"1"'}
+
+
+def test_cache_modified(cache):
+    server = Server()
+    cache.get(server.get, "https://radario.ru/events/1")
+
+    server.content, server.etag = b"new content", '"2"'
+    response = cache.get(server.get, "https://radario.ru/events/1")
+
+    assert response.content == b"new content"
+    assert cache.get(server.get, "https://radario.ru/events/1").content == b"new content"
+
+
+def test_cache_params_in_key(cache):
+    server = Server()
+
+    cache.get(server.get, "https://radario.ru/", params=dict(page=1))
+    cache.get(server.get, "https://radario.ru/", params=dict(page=2))
+
+    assert all("If-None-Match" not in headers for _, _, headers in server.requests)
+
+
+def test_cache_host_ttl(tmp_path):
+    cache = HttpCache(tmp_path / "cache.sqlite", host_ttl={"radario.ru": 60})
+    server = Server()
+
+    cache.get(server.get, "https://radario.ru/events/1")
+    cache.get(server.get, "https://radario.ru/events/1")
+    cache.get(server.get, "https://api.timepad.ru/v1/dictionary/event_statuses")
+    cache.get(server.get, "https://api.timepad.ru/v1/dictionary/event_statuses")
+
+    assert [url for url, _, _ in server.requests] == [
+        "https://radario.ru/events/1",
+        "https://api.timepad.ru/v1/dictionary/event_statuses",
+        "https://api.timepad.ru/v1/dictionary/event_statuses",
+    ]
+
+
+def test_cache_lru_eviction(tmp_path):
+    cache = HttpCache(tmp_path / "cache.sqlite", max_size=25)
+    server = Server(content=b"0123456789")
+
+    cache.get(server.get, "https://radario.ru/events/1")
+    time.sleep(0.01)
+    cache.get(server.get, "https://radario.ru/events/2")
+    time.sleep(0.01)
+    cache.get(server.get, "https://radario.ru/events/1")  # 1 is used recently
+    time.sleep(0.01)
+    cache.get(server.get, "https://radario.ru/events/3")
+
+    assert cache.size == 20
+    assert cache._load(cache.key("https://radario.ru/events/2")) is None
+    assert cache._load(cache.key("https://radario.ru/events/1")) is not None
+
+
+def test_cache_persistent(tmp_path):
+    server = Server()
+    HttpCache(tmp_path / "cache.sqlite").get(server.get, "https://radario.ru/events/1")
+
+    cache = HttpCache(tmp_path / "cache.sqlite")
+    cache.get(server.get, "https://radario.ru/events/1")
+
+    assert cache.size == len(b"test content")
+    assert server.requests[1][2] == {"If-None-Match": '"1"'}
+
+
+#######################################
+## cache BaseParser
+#######################################
+def test_parser_cache(monkeypatch, tmp_path):
+    server = Server()
+
+    def get(session, *args, **kwargs):
+        return server.get(*args, **kwargs)
+
+    monkeypatch.setattr(requests.Session, "get", get)
+
+    radario = Radario(cache=tmp_path / "cache.sqlite")
+    radario._request_get("https://radario.ru/events/1")
+    response = radario._request_get("https://radario.ru/events/1")
+
+    assert response.content == b"test content"
+    assert "If-None-Match" in server.requests[1][2]
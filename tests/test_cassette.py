@@ -0,0 +1,106 @@
+import gzip
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+import requests
+
+from escraper.parsers import Radario
+from escraper.parsers.cassette import Cassette, CassetteMissError
+from escraper.parsers.http import Response
+
+
+TESTDATA = Path(__file__).parent / "test_data" / "test_radario"
+REFERENCE = Radario.TIMEZONE.localize(datetime(2021, 1, 1, 12))
+
+
+@pytest.fixture
+def radario_testdata(monkeypatch):
+    requested = list()
+
+    def get(session, path, **kwargs):
+        requested.append(path)
+        with open(path + ".html", "rb") as file:
+            return Response(path, 200, content=file.read())
+
+    monkeypatch.setattr(requests.Session, "get", get)
+    monkeypatch.setattr(Radario, "BASE_URL", str(TESTDATA / "event_card_1"))
+    monkeypatch.setattr(Radario, "BASE_EVENTS_API", str(TESTDATA) + "/")
+    monkeypatch.setattr(Radario, "_reference_time", lambda self: REFERENCE)
+
+    return requested
+
+
+#######################################
+## cassette record / replay
+#######################################
+def test_cassette_record_replay(radario_testdata, tmp_path):
+    path = tmp_path / "radario.cassette"
+
+    with Cassette(path, mode="record") as cassette:
+        recorded = Radario(cassette=cassette, emoji_seed=0).get_events()
+
+    assert len(cassette) == len(radario_testdata) == 2
+    with gzip.open(path, "rt") as file:
+        assert len(file.readlines()) == 2
+
+    radario_testdata.clear()
+    replayed = Radario(cassette=Cassette(path), emoji_seed=0).get_events()
+
+    assert replayed == recorded
+    assert radario_testdata == []  # without network
+
+
+def test_cassette_replay_latency(radario_testdata, tmp_path):
+    path = tmp_path / "radario.cassette"
+    with Cassette(path, mode="record") as cassette:
+        Radario(cassette=cassette).get_events()
+
+    radario = Radario(cassette=Cassette(path, latency=0.1))
+
+    started_at = time.monotonic()
+    radario.get_events()
+
+    assert time.monotonic() - started_at >= 0.2
+    assert radario.sessions.stats["requests"] == 2
+
+
+def test_cassette_repeated_requests(tmp_path):
+    path = tmp_path / "test.cassette"
+
+    with Cassette(path, mode="record") as cassette:
+        for content in (b"first", b"second"):
+            response = Response("", 200, content=content)
+            cassette.record("https://test.test/", None, response)
+
+    cassette = Cassette(path)
+    assert [cassette.replay("https://test.test/").content for _ in range(3)] == [
+        b"first",
+        b"second",
+        b"second",
+    ]
+
+
+def test_cassette_binary_content(tmp_path):
+    path = tmp_path / "test.cassette"
+    content = bytes(range(256))
+
+    with Cassette(path, mode="record") as cassette:
+        response = Response("", 200, content=content)
+        cassette.record("https://test.test/", dict(a=1), response)
+
+    assert Cassette(path).replay("https://test.test/?a=1").content == content
+
+
+def test_cassette_miss(tmp_path):
+    path = tmp_path / "test.cassette"
+    Cassette(path, mode="record").save()
+
+    with pytest.raises(CassetteMissError):
+        Cassette(path).replay("https://test.test/")
+
+
+def test_cassette_unknown_mode(tmp_path):
+    with pytest.raises(ValueError):
+        Cassette(tmp_path / "test.cassette", mode="unknown")
@@ -0,0 +1,117 @@
+import json
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+import requests
+
+from escraper.cli import format_bytes, main, parse_args
+from escraper.parsers import Radario
+from escraper.parsers.state import StateStore
+
+from .testing import Response
+
+
+TESTDATA = Path(__file__).parent / "test_data" / "test_radario"
+
+
+#######################################
+## cli arguments
+#######################################
+def test_cli_default_sources():
+    args = parse_args([])
+
+    assert args.sources == ["timepad", "radario"]
+    assert args.request_params == dict(timepad=None, radario=None)
+
+
+def test_cli_tags():
+    args = parse_args(["radario", "-t", "id, title,"])
+
+    assert args.tags == ["id", "title"]
+
+
+def test_cli_params():
+    args = parse_args(["radario", "-p", 'radario={"category": ["concert"]}'])
+
+    assert args.request_params == dict(radario=dict(category=["concert"]))
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["unknown"],
+        ["radario", "-p", "timepad={}"],
+        ["radario", "-p", "radario=x"],
+        ["radario", "-t", "id,bogus"],
+    ],
+    ids=["unknown_source", "not_selected_source", "bad_json", "unknown_tag"],
+)
+def test_cli_bad_arguments(argv):
+    with pytest.raises(SystemExit):
+        parse_args(argv)
+
+
+@pytest.mark.parametrize(
+    "size, text",
+    [(0, "0 B"), (1023, "1023 B"), (1536, "1.5 KB"), (3 * 2 ** 20, "3.0 MB")],
+)
+def test_cli_format_bytes(size, text):
+    assert format_bytes(size) == text
+
+
+#######################################
+## cli main
+#######################################
+@pytest.fixture
+def radario_testdata(monkeypatch):
+    def get(session, path, **kwargs):
+        with open(path + ".html") as file:
+            text = file.read()
+
+        return Response(ok=True, text=text, content=text.encode())
+
+    monkeypatch.setattr(requests.Session, "get", get)
+    monkeypatch.setattr(Radario, "BASE_URL", str(TESTDATA / "event_card_1"))
+    monkeypatch.setattr(Radario, "BASE_EVENTS_API", str(TESTDATA) + "/")
+    monkeypatch.setattr(
+        Radario,
+        "_reference_time",
+        lambda self: Radario.TIMEZONE.localize(datetime(2021, 1, 1, 12)),
+    )
+
+
+def test_cli_main(radario_testdata, tmp_path, capsys):
+    output = tmp_path / "events.jsonl"
+    exit_code = main(["radario", "-t", "id,title", "-c", "2", "-o", str(output)])
+
+    assert exit_code == 0
+
+    rows = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    assert [(row["source"], row["id"]) for row in rows] == [("radario", "RADARIO-test id")]
+
+    report = capsys.readouterr().err
+    assert "1 events" in report and "2 requests" in report
+
+
+def test_cli_main_source_failed(monkeypatch, tmp_path, capsys):
+    def get_events(self, request_params=None, tags=None):
+        raise ValueError("test")
+
+    monkeypatch.setattr(Radario, "get_events", get_events)
+
+    with pytest.warns(UserWarning, match="'radario' failed"):
+        exit_code = main(["radario", "-o", str(tmp_path / "events.jsonl")])
+
+    assert exit_code == 1
+    assert "Failed sources: radario" in capsys.readouterr().err
+
+
+def test_cli_main_state_closed(radario_testdata, monkeypatch, tmp_path):
+    closed = list()
+    monkeypatch.setattr(StateStore, "close", lambda self: closed.append(self.path))
+
+    state = tmp_path / "state.sqlite"
+    main(["radario", "--state", str(state), "-o", str(tmp_path / "events.jsonl")])
+
+    assert closed == [str(state)]
@@ -0,0 +1,150 @@
+import itertools
+import threading
+import time
+
+import pytest
+
+from escraper import crawl
+
+
+class FakeParser:
+    def __init__(self, events, delay=0, error=None):
+        self.events = events
+        self.delay = delay
+        self.error = error
+        self.request_params = None
+
+    def get_events(self, request_params=None, tags=None):
+        self.request_params = request_params
+        time.sleep(self.delay)
+
+        if self.error is not None:
+            raise self.error
+
+        return list(self.events)
+
+
+class FakeIterParser(FakeParser):
+    def iter_events(self, request_params=None, tags=None):
+        for event in self.events:
+            time.sleep(self.delay)
+            yield event
+
+
+#######################################
+## crawl
+#######################################
+def test_crawl_sources():
+    parsers = dict(first=FakeParser([1, 2]), second=FakeIterParser([3, None, 4]))
+    request_params = dict(first=dict(test="params"), second=None)
+
+    events = list(crawl(request_params, parsers=parsers))
+
+    assert sorted(events) == [("first", 1), ("first", 2), ("second", 3), ("second", 4)]
+    assert events[0].source in ("first", "second")
+    assert parsers["first"].request_params == dict(test="params")
+
+
+def test_crawl_concurrent():
+    parsers = dict(first=FakeParser([1], delay=0.3), second=FakeParser([2], delay=0.3))
+
+    started_at = time.monotonic()
+    events = list(crawl(dict(first=None, second=None), parsers=parsers))
+
+    assert len(events) == 2
+    assert time.monotonic() - started_at < 0.5
+
+
+def test_crawl_timeout():
+    parsers = dict(
+        fast=FakeParser([1]),
+        slow=FakeIterParser([2, 3, 4], delay=0.2),
+    )
+
+    started_at = time.monotonic()
+    with pytest.warns(UserWarning, match="'slow' timed out"):
+        events = list(crawl(dict(fast=None, slow=None), timeout=dict(slow=0.3), parsers=parsers))
+
+    assert ("fast", 1) in events and ("slow", 2) in events
+    assert ("slow", 4) not in events
+    assert time.monotonic() - started_at < 0.5
+
+
+def test_crawl_source_error():
+    parsers = dict(ok=FakeParser([1]), broken=FakeParser([], error=ValueError("test")))
+
+    with pytest.warns(UserWarning, match="'broken' failed"):
+        events = list(crawl(dict(ok=None, broken=None), parsers=parsers))
+
+    assert events == [("ok", 1)]
+
+
+def test_crawl_unknown_source():
+    with pytest.raises(KeyError):
+        list(crawl(dict(unknown=None)))
+
+
+def test_crawl_limit():
+    class LimitParser(FakeIterParser):
+        def get_events(self, request_params=None, tags=None):
+            return super().get_events(request_params, tags)[: request_params["limit"]]
+
+    parsers = dict(limited=LimitParser(range(100)), paged=LimitParser(range(20)))
+    request_params = dict(limited=dict(limit=10), paged=None)
+
+    events = list(crawl(request_params, parsers=parsers))
+
+    assert sorted(event for source, event in events if source == "limited") == list(range(10))
+    assert sorted(event for source, event in events if source == "paged") == list(range(20))
+
+
+def test_crawl_close_stops_sources(monkeypatch):
+    monkeypatch.setattr("escraper.crawler.QUEUE_SIZE", 10)
+
+    def crawl_threads():
+        return [
+            thread
+            for thread in threading.enumerate()
+            if thread.name.startswith("escraper-crawl-")
+        ]
+
+    parsers = dict(
+        endless=FakeIterParser(itertools.count()),
+        slow=FakeIterParser(itertools.count(), delay=0.01),
+    )
+    events = crawl(dict(endless=None, slow=None), parsers=parsers)
+
+    assert next(events) is not None
+    events.close()
+
+    for thread in crawl_threads():
+        thread.join(timeout=1)
+
+    assert crawl_threads() == []
+
+
+def test_crawl_slow_consumer(monkeypatch):
+    monkeypatch.setattr("escraper.crawler.QUEUE_SIZE", 5)
+    parsers = dict(first=FakeIterParser(range(100)))
+
+    events = list()
+    for event in crawl(dict(first=None), parsers=parsers):
+        events.append(event.event)
+
+    assert events == list(range(100))
+
+
+def test_crawl_failures():
+    parsers = dict(
+        ok=FakeParser([1]),
+        broken=FakeParser([], error=ValueError("test")),
+        slow=FakeParser([2], delay=0.5),
+    )
+    failures = dict()
+
+    with pytest.warns(UserWarning):
+        list(crawl(dict.fromkeys(parsers), timeout=dict(slow=0.1), parsers=parsers, failures=failures))
+
+    assert sorted(failures) == ["broken", "slow"]
+    assert isinstance(failures["broken"], ValueError)
+    assert isinstance(failures["slow"], TimeoutError)
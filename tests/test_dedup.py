@@ -0,0 +1,72 @@
+from collections import namedtuple
+from datetime import datetime
+
+import pytest
+
+from escraper.dedup import DedupIndex, normalize_text
+
+
+event = namedtuple("event", ("title", "place_name", "date_from"))
+
+EVENTS = [
+    event("🎸 Концерт группы Кино", "Главclub", datetime(2021, 1, 1, 19)),
+    event("🦆 Концерт группы «Кино»", "ГлавClub", datetime(2021, 1, 1, 20)),
+    event("🎸 Концерт группы Кино", "Главclub", datetime(2021, 1, 2, 19)),
+    event("🎤 Лекция о космосе", "Планетарий", datetime(2021, 1, 1, 19)),
+]
+
+
+#######################################
+## dedup normalize_text
+#######################################
+def test_normalize_text():
+    assert normalize_text("🎸 Концерт: «Ёлка»!") == "концерт елка"
+    assert normalize_text(None) == ""
+
+
+#######################################
+## dedup DedupIndex
+#######################################
+def test_dedup_index_clusters():
+    index = DedupIndex()
+    index.update(EVENTS)
+
+    assert index.clusters() == [EVENTS[:2]]
+    assert index.unique() == [EVENTS[0], EVENTS[2], EVENTS[3]]
+    assert index.cluster(1) == EVENTS[:2]
+
+
+def test_dedup_index_incremental():
+    index = DedupIndex()
+    index.update(EVENTS[2:])
+    assert index.clusters() == []
+
+    index.add(EVENTS[0])
+    index.add(EVENTS[1])
+    assert index.clusters() == [[EVENTS[0], EVENTS[1]]]
+
+
+def test_dedup_index_transitive():
+    events = [
+        event("Концерт группы Кино", None, datetime(2021, 1, 1)),
+        event("Концерт группы Кино и гости", None, datetime(2021, 1, 1)),
+        event("Группы Кино и гости", None, datetime(2021, 1, 1)),
+    ]
+    index = DedupIndex(threshold=0.6)
+    index.update(events)
+
+    assert index.clusters() == [events]
+
+
+def test_dedup_index_without_date():
+    events = [event("Концерт", None, None), event("Концерт", None, None)]
+    index = DedupIndex()
+    index.update(events + [None])
+
+    assert len(index) == 2
+    assert index.clusters() == [events]
+
+
+def test_dedup_index_bands():
+    with pytest.raises(ValueError):
+        DedupIndex(num_perm=10, bands=3)
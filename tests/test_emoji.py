@@ -0,0 +1,115 @@
+import random
+
+import pytest
+
+from escraper.emoji import KeywordMatcher, add_emoji, emoji_dict
+
+
+def add_emoji_linear(title, rng):
+    """
+    Previous add_emoji implementation (find per keyword).
+    """
+    emoji = None
+
+    for word in list(emoji_dict.keys()):
+        if title.lower().find(word) != -1:
+            emoji = rng.choice(emoji_dict[word])
+            break
+    if emoji is None:
+        emoji = rng.choice(emoji_dict["другое"])
+
+    return f"{emoji} {title}"
+
+
+#######################################
+## emoji KeywordMatcher
+#######################################
+@pytest.mark.parametrize(
+    "text, keyword",
+    [
+        ("abc", "a"),
+        ("cab", "a"),
+        ("xBCx", "b"),
+        ("xyz", None),
+    ],
+)
+def test_keyword_matcher_priority(text, keyword):
+    matcher = KeywordMatcher(["a", "b", "bc"])
+
+    assert matcher.match(text) == keyword
+
+
+def test_keyword_matcher_overlapping():
+    # "ab" hides "bc" for non-overlapping search
+    matcher = KeywordMatcher(["bc", "ab"])
+
+    assert matcher.match("abc") == "bc"
+
+
+@pytest.mark.parametrize(
+    "keywords, text, keyword",
+    [
+        (["ab", "a"], "abc", "ab"),
+        (["a", "ab"], "abc", "a"),
+        (["abc", "b", "a"], "abc", "abc"),
+        (["b", "abc", "a"], "abcb", "b"),
+        (["ab", "a"], "ac", "a"),
+        (["a", "a"], "a", "a"),
+    ],
+)
+def test_keyword_matcher_prefixes(keywords, text, keyword):
+    assert KeywordMatcher(keywords).match(text) == keyword
+
+
+def test_keyword_matcher_same_as_linear():
+    rng = random.Random(0)
+    keywords = [
+        "".join(rng.choice("абв") for _ in range(rng.randint(1, 4))) for _ in range(50)
+    ]
+
+    matcher = KeywordMatcher(keywords)
+
+    for _ in range(200):
+        text = "".join(rng.choice("абвг") for _ in range(rng.randint(0, 10)))
+        expected = next((keyword for keyword in keywords if keyword in text), None)
+
+        assert matcher.match(text) == expected
+
+
+def test_keyword_matcher_without_keywords():
+    assert KeywordMatcher([]).match("abc") is None
+
+
+def test_keyword_matcher_special_chars():
+    matcher = KeywordMatcher(["c++", "."])
+
+    assert matcher.match("Курс C++") == "c++"
+
+
+#######################################
+## emoji add_emoji
+#######################################
+@pytest.mark.parametrize(
+    "title",
+    [
+        "Концерт у залива",
+        "Лекция о космосе",
+        "Вечер кино и музыка",
+        "Фотовыставка",
+        "Мастер-класс",
+        "",
+    ],
+)
+def test_add_emoji_same_as_linear(title):
+    assert add_emoji(title, rng=random.Random(0)) == add_emoji_linear(
+        title, random.Random(0)
+    )
+
+
+def test_add_emoji_seed():
+    titles = ["Мастер-класс", "Концерт"] * 5
+
+    first = [add_emoji(title, rng=random.Random(1)) for title in titles]
+    second = [add_emoji(title, rng=random.Random(1)) for title in titles]
+
+    assert first == second
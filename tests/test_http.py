@@ -0,0 +1,70 @@
+import pytest
+import requests
+
+from escraper.parsers.http import Response, SessionPool
+
+
+#######################################
+## http Response
+#######################################
+def test_response():
+    response = Response("test url", 200, content='{"values": []}'.encode())
+
+    assert response
+    assert response.ok
+    assert response.json() == dict(values=[])
+
+
+def test_response_bad_status():
+    response = Response("test url", 404)
+
+    assert not response
+    assert response.text == ""
+
+
+#######################################
+## http SessionPool
+#######################################
+def test_session_pool_per_host():
+    pool = SessionPool()
+
+    session = pool.session("https://api.timepad.ru/v1/events")
+
+    assert pool.session("https://api.timepad.ru/v1/dictionary") is session
+    assert pool.session("https://radario.ru/events/1") is not session
+
+
+def test_session_pool_settings():
+    pool = SessionPool(pool_size=3, headers={"test": "header"})
+    session = pool.session("https://radario.ru/")
+
+    assert session.get_adapter("https://radario.ru/")._pool_maxsize == 3
+    assert session.headers["test"] == "header"
+    assert "gzip" in session.headers["Accept-Encoding"]
+
+
+@pytest.mark.parametrize(
+    "kwargs, timeout",
+    [(dict(), (5, 30)), (dict(timeout=1), 1)],
+    ids=["default", "custom"],
+)
+def test_session_pool_timeout(monkeypatch, kwargs, timeout):
+    def get(session, url, **kwargs):
+        return kwargs["timeout"]
+
+    monkeypatch.setattr(requests.Session, "get", get)
+
+    assert SessionPool().get("https://radario.ru/", **kwargs) == timeout
+
+
+def test_session_pool_stats(monkeypatch):
+    def get(session, url, **kwargs):
+        return Response(url, 200, content=b"12345")
+
+    monkeypatch.setattr(requests.Session, "get", get)
+
+    pool = SessionPool()
+    pool.get("https://radario.ru/")
+    pool.get("https://api.timepad.ru/")
+
+    assert pool.stats == dict(requests=2, bytes=10)
@@ -0,0 +1,66 @@
+import subprocess
+import sys
+
+import pytest
+
+import escraper
+from escraper.parsers import all_parsers
+
+
+# "import escraper" cumulative time by "python -X importtime"
+IMPORT_TIME_BUDGET_US = 50_000
+HEAVY_MODULES = ("requests", "bs4", "pytz", "find_metro", "aiohttp", "sqlite3")
+
+
+def run_python(code, *options):
+    return subprocess.run(
+        [sys.executable, *options, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+#######################################
+## import escraper
+#######################################
+def test_import_escraper_time():
+    stderr = run_python("import escraper", "-X", "importtime").stderr
+
+    # line format: "import time: self [us] | cumulative | imported package"
+    cumulative = [
+        int(line.split("|")[1])
+        for line in stderr.splitlines()
+        if line.split("|")[-1].strip() == "escraper"
+    ]
+
+    assert cumulative and cumulative[0] < IMPORT_TIME_BUDGET_US
+
+
+def test_import_escraper_lazy():
+    stdout = run_python(
+        "import sys, escraper, escraper.parsers;"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    ).stdout
+
+    assert stdout.strip() == ""
+
+
+@pytest.mark.parametrize(
+    "name, class_name",
+    [("timepad", "Timepad"), ("radario", "Radario")],
+)
+def test_lazy_parsers(name, class_name):
+    parser = getattr(escraper, class_name)
+
+    assert parser.__name__ == class_name
+    assert all_parsers[name] is parser
+    assert dict(all_parsers)[name] is parser
+
+
+def test_lazy_unknown_attribute():
+    with pytest.raises(AttributeError):
+        escraper.Unknown
+
+    with pytest.raises(KeyError):
+        all_parsers["unknown"]
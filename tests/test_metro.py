@@ -0,0 +1,107 @@
+import find_metro
+import pytest
+
+from escraper.parsers import metro, Timepad
+from escraper.parsers.metro import SubwayCache, get_city_subway, normalize_address
+
+
+class Lookup:
+    def __init__(self):
+        self.addresses = list()
+
+    def __call__(self, address):
+        self.addresses.append(address)
+        return None if "онлайн" in address else "test subway"
+
+
+#######################################
+## metro normalize_address
+#######################################
+@pytest.mark.parametrize(
+    "address",
+    [
+        "Невский пр., 1",
+        "  невский пр.,1 ",
+        "НЕВСКИЙ  пр. , 1,",
+    ],
+)
+def test_normalize_address(address):
+    assert normalize_address(address) == "невский пр., 1"
+
+
+#######################################
+## metro SubwayCache
+#######################################
+def test_subway_cache_hits():
+    lookup = Lookup()
+    cache = SubwayCache(lookup)
+
+    assert cache.get("Невский пр., 1") == "test subway"
+    assert cache.get("невский пр.,1") == "test subway"
+    assert cache.get("онлайн") is None
+    assert cache.get("онлайн") is None
+
+    assert lookup.addresses == ["Невский пр., 1", "онлайн"]
+    assert cache.stats["hits"] == 2
+    assert cache.stats["misses"] == 2
+
+
+def test_subway_cache_lru():
+    lookup = Lookup()
+    cache = SubwayCache(lookup, maxsize=2)
+
+    cache.get("address 1")
+    cache.get("address 2")
+    cache.get("address 1")
+    cache.get("address 3")  # address 2 is removed
+    cache.get("address 1")
+    cache.get("address 2")
+
+    assert lookup.addresses == ["address 1", "address 2", "address 3", "address 2"]
+
+
+def test_subway_cache_persistent(tmp_path):
+    path = tmp_path / "subway.json"
+    cache = SubwayCache(Lookup(), path=path)
+    cache.get("Невский пр., 1")
+    cache.save()
+
+    lookup = Lookup()
+    assert SubwayCache(lookup, path=path).get("Невский пр., 1") == "test subway"
+    assert lookup.addresses == []
+
+
+#######################################
+## metro get_city_subway
+#######################################
+@pytest.fixture
+def subway_index(monkeypatch):
+    built = list()
+
+    class Subway:
+        def __init__(self, city_id):
+            built.append(city_id)
+            self.city_id = city_id
+
+        def get_subway(self, address):
+            return f"test subway {self.city_id}"
+
+    monkeypatch.setattr(metro, "_subways", dict())
+    monkeypatch.setattr(find_metro.metro, "get_subway_name", Subway)
+
+    return built
+
+
+def test_city_subway_shared(subway_index):
+    assert get_city_subway(2) is get_city_subway(2)
+    assert get_city_subway(1).city_id == 1
+    assert subway_index == [2, 1]
+
+
+def test_timepad_city_subway_lazy(subway_index):
+    timepads = [Timepad(), Timepad(), Timepad(city_id=1)]
+    assert subway_index == []
+
+    assert timepads[0].city_subway is timepads[1].city_subway
+    assert timepads[2].subway_cache.get("test address") == "test subway 1"
+    assert subway_index == [2, 1]
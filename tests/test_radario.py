@@ -1,21 +1,37 @@
+import asyncio
+import time
+
 import pytest
 import requests
+from bs4 import BeautifulSoup
 from datetime import datetime
 from pathlib import Path
 
 from escraper.parsers import Radario
+from escraper.parsers.radario import EventPage, parse_date_ranges
+from escraper.parsers.retry import RetryPolicy
 
 from .testing import Response
 
 
 TESTDATA = Path(__file__).parent / "test_data" / "test_radario"
 ZEROS = dict(minute=00, second=00, microsecond=00)
+REFERENCE = Radario.TIMEZONE.localize(datetime(2021, 1, 1, 12))
 
 
 def get_radario_date():
     return datetime.now(tz=Radario.TIMEZONE).strftime(Radario.DATETIME_STRF)
 
 
+def radario_datetime(*args):
+    return Radario.TIMEZONE.localize(datetime(*args))
+
+
+@pytest.fixture(autouse=True)
+def reference_time(monkeypatch):
+    monkeypatch.setattr(Radario, "_reference_time", lambda self: REFERENCE)
+
+
 #######################################
 ## radario get_event
 #######################################
@@ -29,13 +45,13 @@ def test_radario_get_event():
 #######################################
 @pytest.fixture
 def requests_get_events(monkeypatch):
-    def get(path, **kwargs):
+    def get(session, path, **kwargs):
         with open(path + ".html") as file:
             text = file.read()
 
         return Response(ok=True, text=text)
 
-    monkeypatch.setattr(requests, "get", get)
+    monkeypatch.setattr(requests.Session, "get", get)
     monkeypatch.setattr(Radario, "BASE_URL", str(TESTDATA / "event_card_1"))
     monkeypatch.setattr(Radario, "BASE_EVENTS_API", str(TESTDATA) + "/")
 
@@ -62,12 +78,99 @@ def test_radario_get_events(requests_get_events):
     assert event.is_registration_open is True
 
 
+@pytest.mark.parametrize("html_parser", ["html.parser", "lxml"])
+def test_radario_html_parser(requests_get_events, html_parser):
+    if html_parser == "lxml":
+        pytest.importorskip("lxml")
+
+    tags = [
+        "adress",
+        "category",
+        "id",
+        "place_name",
+        "post_text",
+        "poster_imag",
+        "price",
+    ]
+    events = Radario(html_parser=html_parser).get_events(tags=tags)
+
+    assert len(events) == 1
+    assert events[0] == (
+        "test adress",
+        "test category",
+        Radario.parser_prefix + "test id",
+        "test place_name",
+        "test post_text",
+        "test_image.png",
+        "test price",
+    )
+
+
+def test_radario_get_events_concurrent(monkeypatch):
+    event_ids = ["4", "missing", "2", "3", "1"]
+    listing = "".join(
+        f'<div class="event-card"><a class="event-card__title" href="/events/{event_id}"></a></div>'
+        for event_id in event_ids
+    )
+
+    def get(session, path, **kwargs):
+        if path == "listing":
+            return Response(ok=True, text=listing)
+
+        # finish requests in reverse order
+        time.sleep(0.01 * (len(event_ids) - event_ids.index(Path(path).name)))
+
+        if not Path(path + ".html").exists():
+            raise requests.ConnectionError(path)
+
+        with open(path + ".html") as file:
+            text = file.read()
+
+        return Response(ok=True, text=text)
+
+    monkeypatch.setattr(requests.Session, "get", get)
+    monkeypatch.setattr(Radario, "BASE_URL", "listing")
+    monkeypatch.setattr(Radario, "BASE_EVENTS_API", str(TESTDATA) + "/")
+
+    with pytest.warns(UserWarning, match="Failed to get event page 'missing'"):
+        events = Radario(
+            max_workers=4, retry_policy=RetryPolicy(max_retries=0)
+        ).get_events(tags=["adress"])
+
+    assert [event.adress for event in events] == [
+        "Test avenue, 111",
+        "Онлайн",
+        "Test avenue",
+        "test adress",
+    ]
+
+
+def test_radario_get_events_async(monkeypatch):
+    pytest.importorskip("aiohttp")
+
+    async def get(path, **kwargs):
+        with open(path + ".html") as file:
+            text = file.read()
+
+        return Response(ok=True, text=text)
+
+    monkeypatch.setattr(Radario, "_request_get_async", lambda self, *args, **kwargs: get(*args, **kwargs))
+    monkeypatch.setattr(Radario, "BASE_URL", str(TESTDATA / "event_card_1"))
+    monkeypatch.setattr(Radario, "BASE_EVENTS_API", str(TESTDATA) + "/")
+
+    events = asyncio.run(Radario().get_events_async(tags=["id", "place_name"]))
+
+    assert len(events) == 1
+    assert events[0].id == Radario.parser_prefix + "test id"
+    assert events[0].place_name == "test place_name"
+
+
 @pytest.fixture
 def requests_get_empty(monkeypatch):
     def get(*args, **kwargs):
         return Response(ok=False)
 
-    monkeypatch.setattr(requests, "get", get)
+    monkeypatch.setattr(requests.Session, "get", get)
 
 
 def test_radario_get_events_empty_online(requests_get_empty):
@@ -99,18 +202,120 @@ def test_radario_get_events_date_for_request(requests_get_empty):
         Radario().get_events(request_params={"from": "", "to": ""})
 
 
+def test_radario_get_events_state(monkeypatch, tmp_path):
+    requested_pages = list()
+
+    def get(session, path, **kwargs):
+        requested_pages.append(path)
+        with open(path + ".html") as file:
+            text = file.read()
+
+        return Response(ok=True, text=text)
+
+    monkeypatch.setattr(requests.Session, "get", get)
+    monkeypatch.setattr(Radario, "BASE_URL", str(TESTDATA / "event_card_1"))
+    monkeypatch.setattr(Radario, "BASE_EVENTS_API", str(TESTDATA) + "/")
+
+    radario = Radario(state=tmp_path / "state.sqlite")
+
+    assert len(radario.get_events(tags=("id",))) == 1
+    assert len(requested_pages) == 2
+
+    # known event with unchanged listing card: page is not requested
+    assert radario.get_events(tags=("id",)) == []
+    assert len(requested_pages) == 3
+
+
+def test_radario_get_events_state_parse_error(monkeypatch, tmp_path):
+    def get(session, path, **kwargs):
+        if path.startswith("listing/"):
+            event_id = "1" if path.endswith("concert") else "2"
+            return Response(
+                ok=True,
+                text=f'<div class="event-card"><a class="event-card__title" href="/events/{event_id}"></a></div>',
+            )
+
+        with open(path + ".html") as file:
+            text = file.read()
+
+        return Response(ok=True, text=text)
+
+    monkeypatch.setattr(requests.Session, "get", get)
+    monkeypatch.setattr(Radario, "BASE_URL", "listing/")
+    monkeypatch.setattr(Radario, "BASE_EVENTS_API", str(TESTDATA) + "/")
+
+    events_from_responses = Radario._events_from_responses
+    calls = list()
+
+    def failing_events_from_responses(self, *args, **kwargs):
+        calls.append(args)
+        if len(calls) == 2:
+            raise TypeError("test")
+
+        return events_from_responses(self, *args, **kwargs)
+
+    monkeypatch.setattr(Radario, "_events_from_responses", failing_events_from_responses)
+
+    radario = Radario(state=tmp_path / "state.sqlite")
+    params = dict(category=["concert", "theatre"])
+
+    # second category is failed: events of first category are not recorded
+    with pytest.raises(TypeError):
+        radario.get_events(request_params=dict(params), tags=("adress",))
+
+    events = radario.get_events(request_params=dict(params), tags=("adress",))
+
+    assert [event.adress for event in events] == ["test adress", "Онлайн"]
+
+
+#######################################
+## radario parse
+#######################################
+def test_radario_parse_soup():
+    radario = Radario()
+    with open(TESTDATA / "1.html") as file:
+        soup = BeautifulSoup(file.read(), radario.html_parser)
+
+    tags = ["adress", "id", "place_name", "date_from"]
+    event = radario.parse(soup, tags=tags)
+
+    assert event == radario.parse(EventPage(soup), tags=tags)
+    assert event.adress == "test adress"
+    assert event.id == Radario.parser_prefix + "test id"
+    assert event.date_from == radario_datetime(2021, 1, 1, 0)
+
+
+def test_radario_parse_lazy_releases_page():
+    with open(TESTDATA / "1.html") as file:
+        soup = BeautifulSoup(file.read(), "html.parser")
+
+    event = Radario(lazy=True).parse(soup, tags=["id", "place_name"])
+
+    assert event.id == Radario.parser_prefix + "test id"
+    assert isinstance(event._data, EventPage)
+
+    # hash computes all tags, event page is released
+    assert len({event, event}) == 1
+    assert event._data is None
+
+
+def test_radario_parse_without_tags():
+    with pytest.raises(ValueError):
+        Radario().parse(BeautifulSoup("", "html.parser"))
+
+
 #######################################
 ## radario _adress
 #######################################
 @pytest.fixture
 def requests_get_adress_online(monkeypatch):
-    def get(path, **kwargs):
+    def get(session, path, **kwargs):
         with open(path + ".html") as file:
             text = file.read()
 
         return Response(ok=True, text=text)
 
-    monkeypatch.setattr(requests, "get", get)
+    monkeypatch.setattr(requests.Session, "get", get)
     monkeypatch.setattr(Radario, "BASE_URL", str(TESTDATA / "event_card_2"))
     monkeypatch.setattr(Radario, "BASE_EVENTS_API", str(TESTDATA) + "/")
 
@@ -126,13 +331,13 @@ def test_radario_adress_online(requests_get_adress_online):
 
 @pytest.fixture
 def requests_get_adress_saint_petersburg(monkeypatch):
-    def get(path, **kwargs):
+    def get(session, path, **kwargs):
         with open(path + ".html") as file:
             text = file.read()
 
         return Response(ok=True, text=text)
 
-    monkeypatch.setattr(requests, "get", get)
+    monkeypatch.setattr(requests.Session, "get", get)
     monkeypatch.setattr(Radario, "BASE_URL", str(TESTDATA / "event_card_3"))
     monkeypatch.setattr(Radario, "BASE_EVENTS_API", str(TESTDATA) + "/")
 
@@ -148,13 +353,13 @@ def test_radario_adress_saint_petersburg(requests_get_adress_saint_petersburg):
 
 @pytest.fixture
 def requests_get_adress_without_cityname(monkeypatch):
-    def get(path, **kwargs):
+    def get(session, path, **kwargs):
         with open(path + ".html") as file:
             text = file.read()
 
         return Response(ok=True, text=text)
 
-    monkeypatch.setattr(requests, "get", get)
+    monkeypatch.setattr(requests.Session, "get", get)
     monkeypatch.setattr(Radario, "BASE_URL", str(TESTDATA / "event_card_4"))
     monkeypatch.setattr(Radario, "BASE_EVENTS_API", str(TESTDATA) + "/")
 
@@ -171,9 +376,9 @@ def test_radario_adress_without_cityname(requests_get_adress_without_cityname):
 @pytest.mark.parametrize(
     "test_file, date_from, date_to",
     [
-        ("event_card_5", datetime.now(tz=Radario.TIMEZONE).replace(month=1, day=1, hour=00, **ZEROS), datetime.now(tz=Radario.TIMEZONE).replace(month=1, day=1, hour=1, **ZEROS)),
-        ("event_card_6", datetime.now(tz=Radario.TIMEZONE).replace(month=1, day=1, hour=00, **ZEROS), None),
-        ("event_card_7", datetime.now(tz=Radario.TIMEZONE).replace(month=1, day=1, hour=00, **ZEROS), datetime.now(tz=Radario.TIMEZONE).replace(month=1, day=2, hour=00, **ZEROS)),
+        ("event_card_5", radario_datetime(2021, 1, 1, 0), radario_datetime(2021, 1, 1, 1)),
+        ("event_card_6", radario_datetime(2021, 1, 1, 0), None),
+        ("event_card_7", radario_datetime(2021, 1, 1, 0), radario_datetime(2021, 1, 2, 0)),
     ],
     ids=[
         "dd month, HH:MM-HH:MM",
@@ -182,13 +387,13 @@ def test_radario_adress_without_cityname(requests_get_adress_without_cityname):
     ],
 )
 def test_radario_date_from_to(monkeypatch, test_file, date_from, date_to):
-    def get(path, **kwargs):
+    def get(session, path, **kwargs):
         with open(path + ".html") as file:
             text = file.read()
 
         return Response(ok=True, text=text)
 
-    monkeypatch.setattr(requests, "get", get)
+    monkeypatch.setattr(requests.Session, "get", get)
     monkeypatch.setattr(Radario, "BASE_URL", str(TESTDATA / test_file))
     monkeypatch.setattr(Radario, "BASE_EVENTS_API", str(TESTDATA) + "/")
 
@@ -198,3 +403,68 @@ def test_radario_date_from_to(monkeypatch, test_file, date_from, date_to):
 
     event = events[0]
     assert event.date_from == date_from and event.date_to == date_to
+
+
+@pytest.mark.parametrize(
+    "string, date_from, date_to",
+    [
+        ("01 января", radario_datetime(2021, 1, 1, 0), None),
+        ("1 января, 9:30", radario_datetime(2021, 1, 1, 9, 30), None),
+        ("01 января - 03 февраля", radario_datetime(2021, 1, 1), radario_datetime(2021, 2, 3)),
+        ("01-03 января, 10:00-18:00", radario_datetime(2021, 1, 1, 10), radario_datetime(2021, 1, 3, 18)),
+        ("01 января, 23:00-02:00", radario_datetime(2021, 1, 1, 23), radario_datetime(2021, 1, 2, 2)),
+    ],
+    ids=[
+        "dd month",
+        "d month, H:MM",
+        "dd month - dd month",
+        "dd-dd month, HH:MM-HH:MM",
+        "time to after midnight",
+    ],
+)
+def test_radario_parse_date_ranges(string, date_from, date_to):
+    results, unparsed = parse_date_ranges([string], REFERENCE, Radario.TIMEZONE)
+
+    assert results == [(date_from, date_to)]
+    assert unparsed == []
+
+
+@pytest.mark.parametrize(
+    "string, date_from, date_to",
+    [
+        ("15 июня", radario_datetime(2021, 6, 15), None),
+        ("30 декабря - 02 января", radario_datetime(2020, 12, 30), radario_datetime(2021, 1, 2)),
+        ("01 декабря - 31 января", radario_datetime(2020, 12, 1), radario_datetime(2021, 1, 31)),
+    ],
+    ids=["same year", "new year in range", "running event"],
+)
+def test_radario_parse_date_ranges_year(string, date_from, date_to):
+    results, _ = parse_date_ranges([string], REFERENCE, Radario.TIMEZONE)
+
+    assert results == [(date_from, date_to)]
+
+
+@pytest.mark.parametrize(
+    "reference, string, date_from",
+    [
+        (radario_datetime(2020, 12, 20, 12), "10 января, 19:00", radario_datetime(2021, 1, 10, 19)),
+        (radario_datetime(2021, 6, 1, 12), "15 декабря, 19:00", radario_datetime(2021, 12, 15, 19)),
+        (radario_datetime(2021, 6, 1, 12), "15 мая, 19:00", radario_datetime(2022, 5, 15, 19)),
+        (radario_datetime(2021, 6, 1, 12), "30 мая, 19:00", radario_datetime(2021, 5, 30, 19)),
+        (radario_datetime(2021, 6, 1, 12), "29 февраля", radario_datetime(2024, 2, 29)),
+    ],
+    ids=["next year", "more than half year ahead", "past", "started in grace", "29 february"],
+)
+def test_radario_parse_date_ranges_upcoming(reference, string, date_from):
+    results, _ = parse_date_ranges([string], reference, Radario.TIMEZONE)
+
+    assert results == [(date_from, None)]
+
+
+def test_radario_parse_date_ranges_unparsed():
+    strings = ["01 января", "завтра", "32 января", "01 мартобря"]
+
+    results, unparsed = parse_date_ranges(strings, REFERENCE, Radario.TIMEZONE)
+
+    assert results == [(radario_datetime(2021, 1, 1), None), None, None, None]
+    assert unparsed == ["завтра", "32 января", "01 мартобря"]
@@ -0,0 +1,139 @@
+import time
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import requests
+
+from escraper.parsers import Radario
+from escraper.parsers.http import Response
+from escraper.parsers.retry import HostRateLimiter, RateLimiter, RetryPolicy, get_retry_after
+
+
+#######################################
+## retry RetryPolicy
+#######################################
+@pytest.mark.parametrize(
+    "status_code, attempt, retry",
+    [(429, 0, True), (503, 2, True), (503, 3, False), (404, 0, False)],
+    ids=["too_many_requests", "server_error", "max_retries", "not_found"],
+)
+def test_retry_policy_retry_response(status_code, attempt, retry):
+    response = Response("test url", status_code)
+    assert RetryPolicy(max_retries=3).retry_response(response, attempt) is retry
+
+
+def test_retry_policy_backoff():
+    policy = RetryPolicy(backoff_factor=1, max_backoff=5, jitter=False)
+
+    assert [policy.delay(attempt) for attempt in range(5)] == [1, 2, 4, 5, 5]
+
+
+def test_retry_policy_jitter():
+    policy = RetryPolicy(backoff_factor=1)
+
+    assert all(0 <= policy.delay(2) <= 4 for _ in range(100))
+
+
+IN_30_SECONDS = datetime.now(tz=timezone.utc) + timedelta(seconds=30)
+
+
+@pytest.mark.parametrize(
+    "retry_after, delay",
+    [
+        ("2", 2),
+        (format_datetime(IN_30_SECONDS, usegmt=True), 30),
+        ("invalid", None),
+    ],
+    ids=["seconds", "http_date", "invalid"],
+)
+def test_retry_after(retry_after, delay):
+    response = Response("test url", 429, headers={"Retry-After": retry_after})
+
+    if delay is None:
+        assert get_retry_after(response) is None
+    else:
+        assert get_retry_after(response) == pytest.approx(delay, abs=5)
+
+
+def test_retry_policy_prefers_retry_after():
+    response = Response("test url", 429, headers={"Retry-After": "7"})
+    assert RetryPolicy(backoff_factor=100).delay(0, response) == 7
+
+
+#######################################
+## retry RateLimiter
+#######################################
+def test_rate_limiter_burst():
+    limiter = RateLimiter(rate=1000, burst=5)
+
+    delays = [limiter._reserve() for _ in range(7)]
+
+    assert delays[:5] == [0] * 5
+    assert delays[5] == pytest.approx(0.001, abs=1e-4)
+    assert delays[6] == pytest.approx(0.002, abs=1e-4)
+
+
+def test_rate_limiter_pause():
+    limiter = RateLimiter(rate=10)
+    limiter.pause(2)
+
+    assert limiter._reserve() == pytest.approx(2.1, abs=0.01)
+
+
+def test_host_rate_limiter():
+    limiter = HostRateLimiter({"api.timepad.ru": (10, 2)})
+
+    assert limiter.get("https://api.timepad.ru/v1/events").burst == 2
+    assert limiter.get("https://radario.ru/events/") is None
+
+
+#######################################
+## retry BaseParser._request_get
+#######################################
+def test_request_get_retry(monkeypatch):
+    responses = [
+        Response("test url", 429, headers={"Retry-After": "1"}),
+        Response("test url", 503),
+        Response("test url", 200),
+    ]
+    delays = list()
+
+    def get(*args, **kwargs):
+        return responses.pop(0)
+
+    monkeypatch.setattr(requests.Session, "get", get)
+    monkeypatch.setattr(time, "sleep", delays.append)
+
+    radario = Radario(retry_policy=RetryPolicy(backoff_factor=2, jitter=False))
+    with pytest.warns(UserWarning, match="Retry"):
+        response = radario._request_get("https://radario.ru/")
+
+    assert response.ok
+    assert delays == [1, 4]
+
+
+def test_request_get_not_retryable(monkeypatch):
+    calls = list()
+
+    def get(*args, **kwargs):
+        calls.append(args)
+        return Response("test url", 404)
+
+    monkeypatch.setattr(requests.Session, "get", get)
+
+    with pytest.warns(UserWarning, match="Break"):
+        assert Radario()._request_get("https://radario.ru/") is None
+
+    assert len(calls) == 1
+
+
+def test_request_get_connection_error(monkeypatch):
+    def get(*args, **kwargs):
+        raise requests.ConnectionError()
+
+    monkeypatch.setattr(requests.Session, "get", get)
+    monkeypatch.setattr(time, "sleep", lambda delay: None)
+
+    with pytest.raises(requests.ConnectionError):
+        Radario()._request_get("https://radario.ru/")
@@ -0,0 +1,129 @@
+import csv
+import json
+from collections import namedtuple
+from datetime import datetime
+
+import pytest
+import pytz
+
+from escraper.crawler import SourceEvent
+from escraper.parsers import ALL_EVENT_TAGS, Timepad
+from escraper.parsers.metro import SubwayCache
+from escraper.sinks import CsvSink, EventSink, JsonlSink, open_sink, write_events
+
+
+TIMEZONE = pytz.timezone("Europe/Moscow")
+
+event = namedtuple("event", ("id", "date_from", "date_to", "is_registration_open"))
+
+EVENTS = [
+    event("TIMEPAD-1", TIMEZONE.localize(datetime(2021, 1, 1, 19)), None, True),
+    None,
+    event(
+        "RADARIO-2",
+        TIMEZONE.localize(datetime(2021, 1, 2, 19)),
+        TIMEZONE.localize(datetime(2021, 1, 2, 21)),
+        False,
+    ),
+]
+
+
+#######################################
+## sinks
+#######################################
+def test_jsonl_sink(tmp_path):
+    path = tmp_path / "events.jsonl"
+
+    assert write_events(EVENTS, path, batch_size=1) == 2
+
+    rows = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert rows[0] == dict(
+        id="TIMEPAD-1",
+        date_from="2021-01-01T19:00:00+03:00",
+        date_to=None,
+        is_registration_open=True,
+    )
+    assert rows[1]["date_to"] == "2021-01-02T21:00:00+03:00"
+
+
+def test_csv_sink(tmp_path):
+    path = tmp_path / "events.csv"
+    write_events(EVENTS, path)
+
+    with open(path, encoding="utf-8") as file:
+        rows = list(csv.DictReader(file))
+
+    assert [row["id"] for row in rows] == ["TIMEPAD-1", "RADARIO-2"]
+    assert rows[0]["date_from"] == "2021-01-01T19:00:00+03:00"
+
+
+def test_sink_batches(tmp_path, monkeypatch):
+    batches = list()
+    monkeypatch.setattr(JsonlSink, "_write_batch", lambda self, batch: batches.append(len(batch)))
+
+    with JsonlSink(tmp_path / "events.jsonl", batch_size=2) as sink:
+        sink.write_many(EVENTS * 3)
+
+    assert batches == [2, 2, 2]
+
+
+def test_sink_source_events(tmp_path):
+    path = tmp_path / "events.csv"
+
+    with CsvSink(path) as sink:
+        sink.write(SourceEvent("timepad", EVENTS[0]))
+
+    assert path.read_text().splitlines()[0] == "source,id,date_from,date_to,is_registration_open"
+
+
+def test_parquet_sink(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "events.parquet"
+
+    write_events(EVENTS, path, batch_size=1)
+
+    table = pq.read_table(path)
+    assert table.num_rows == 2
+    assert str(table.schema.field("date_from").type) == "timestamp[us, tz=UTC]"
+    assert table.column("date_from")[0].as_py() == EVENTS[0].date_from
+    assert table.column("date_to").to_pylist()[0] is None
+    assert table.column("is_registration_open").to_pylist() == [True, False]
+
+
+def test_parquet_sink_timepad_event(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "events.parquet"
+
+    timepad = Timepad(token="test", subway_cache=SubwayCache(lambda address: None))
+    timepad_event = dict(
+        id=1,
+        name="Концерт",
+        starts_at="2021-01-02T19:00:00+0300",
+        location=dict(city="Санкт-Петербург", address="Невский пр., 1"),
+        categories=[dict(name="Концерты")],
+        organization=dict(name="Филармония"),
+        description_html="<p>Описание</p>",
+        poster_image=dict(uploadcare_url="//ucare.timepad.ru/test/"),
+        registration_data=dict(is_registration_open=True, price_min=0, price_max=500),
+        ticket_types=[dict(price=500, status="ok")],
+        url="https://test.timepad.ru/event/1/",
+        moderation_status="moderated",
+    )
+    record = timepad.parse(timepad_event, tags=ALL_EVENT_TAGS)
+
+    write_events([record], path)
+
+    row = pq.read_table(path).to_pylist()[0]
+    assert row["id"] == "TIMEPAD-1"
+    assert row["is_registration_open"] is True
+    assert row["date_from"] == record.date_from
+
+
+def test_sink_is_abstract(tmp_path):
+    with pytest.raises(TypeError):
+        EventSink(tmp_path / "events")
+
+
+def test_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        open_sink(tmp_path / "events.xml")
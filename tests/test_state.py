@@ -0,0 +1,67 @@
+import pytest
+
+from escraper.parsers.state import StateStore
+from escraper.parsers.utils import fingerprint
+
+
+#######################################
+## state StateStore
+#######################################
+@pytest.fixture
+def state(tmp_path):
+    return StateStore(tmp_path / "state.sqlite")
+
+
+def test_state_unchanged(state):
+    state.add("TIMEPAD-1", "a")
+
+    assert state.is_unchanged("TIMEPAD-1", "a")
+    assert not state.is_unchanged("TIMEPAD-1", "b")
+    assert not state.is_unchanged("TIMEPAD-2", "a")
+
+
+def test_state_update(state):
+    state.add_many([("TIMEPAD-1", "a"), ("RADARIO-1", "a")])
+    state.add("TIMEPAD-1", "b")
+
+    assert len(state) == 2
+    assert state.is_unchanged("TIMEPAD-1", "b")
+
+
+def test_state_marks(state):
+    assert state.get_mark("test", "default") == "default"
+
+    state.set_mark("test", "value")
+
+    assert state.get_mark("test") == "value"
+
+
+def test_state_persistent(tmp_path):
+    path = tmp_path / "state.sqlite"
+
+    state = StateStore(path)
+    state.add("TIMEPAD-1", "a")
+    state.set_mark("test", "value")
+    state.close()
+
+    state = StateStore(path)
+    assert state.is_unchanged("TIMEPAD-1", "a")
+    assert state.get_mark("test") == "value"
+
+
+def test_state_clear(state):
+    state.add("TIMEPAD-1", "a")
+    state.set_mark("test", "value")
+    state.clear()
+
+    assert len(state) == 0
+    assert state.get_mark("test") is None
+
+
+#######################################
+## utils fingerprint
+#######################################
+def test_fingerprint():
+    assert fingerprint(dict(a=1, b=[1, 2])) == fingerprint(dict(b=[1, 2], a=1))
+    assert fingerprint(dict(a=1)) != fingerprint(dict(a=2))
+    assert fingerprint("<div>card</div>") != fingerprint("<div>other card</div>")
@@ -1,3 +1,4 @@
+import asyncio
 import os
 from datetime import datetime
 
@@ -61,7 +62,7 @@ def requests_get_event(monkeypatch):
     def get(*args, **kwargs):
         return Response(ok=True, json_items=timepad_response_event)
 
-    monkeypatch.setattr(requests, "get", get)
+    monkeypatch.setattr(requests.Session, "get", get)
 
 
 def test_timepad_get_event_by_id(requests_get_event):
@@ -78,6 +79,60 @@ def test_timepad_get_event_with_tags(requests_get_event):
     assert event._fields == tags
 
 
+def test_timepad_get_event_record_class_reused(requests_get_event):
+    tags = ["id", "url"]
+    timepad = Timepad()
+
+    first = timepad.get_event(event_id=12345, tags=tags)
+    second = timepad.get_event(event_id=12345, tags=tags)
+
+    assert type(first) is type(second)
+    assert first == second == (Timepad.parser_prefix + "1", "https://test.test")
+
+
+def test_timepad_get_event_unsupported_tag(requests_get_event):
+    with pytest.raises(TypeError, match="Unsupported event tag found: unknown"):
+        Timepad().get_event(event_id=12345, tags=("id", "unknown"))
+
+
+def test_timepad_get_event_lazy(requests_get_event, monkeypatch):
+    title_calls = list()
+
+    def _title(self, event):
+        title_calls.append(event)
+        return event["name"]
+
+    monkeypatch.setattr(Timepad, "_title", _title)
+
+    tags = ("id", "title", "url")
+    timepad = Timepad(lazy=True)
+    event = timepad.get_event(event_id=12345, tags=tags)
+
+    assert event.id == Timepad.parser_prefix + "1"
+    assert title_calls == []
+
+    assert event.title == event.title == "test"
+    assert len(title_calls) == 1
+
+    assert event._fields == tags
+    assert event == timepad.parse(timepad_response_event, tags=tags, lazy=False)
+    assert event._asdict()["url"] == "https://test.test"
+
+
+def test_timepad_lazy_event_hash(requests_get_event):
+    tags = ("id", "url")
+    timepad = Timepad(lazy=True)
+    event = timepad.get_event(event_id=12345, tags=tags)
+    record = timepad.parse(timepad_response_event, tags=tags, lazy=False)
+
+    assert hash(event) == hash(record)
+    assert {event, record} == {record}
+    assert {event: 1}[record] == 1
+
+    # all tags are computed, raw event data is released
+    assert event._data is None
+
+
 def test_timepad_get_event_without_args(requests_get_event):
     with pytest.raises(ValueError):
         Timepad().get_event()
@@ -92,7 +147,7 @@ def requests_get_event_not_moderated(monkeypatch):
     def get(*args, **kwargs):
         return Response(ok=True, json_items=timepad_response_event)
 
-    monkeypatch.setattr(requests, "get", get)
+    monkeypatch.setattr(requests.Session, "get", get)
 
 
 def test_timepad_get_event_not_moderated(requests_get_event_not_moderated):
@@ -107,13 +162,36 @@ def requests_get_events(monkeypatch):
     def get(*args, **kwargs):
         return Response(ok=True, json_items=dict(values=[timepad_response_event]))
 
-    monkeypatch.setattr(requests, "get", get)
+    monkeypatch.setattr(requests.Session, "get", get)
 
 
 def test_timepad_get_events(requests_get_events):
     assert len(Timepad().get_events()) == 1
 
 
+def test_timepad_get_events_async(monkeypatch):
+    async def get(*args, **kwargs):
+        return Response(ok=True, json_items=dict(values=[timepad_response_event]))
+
+    monkeypatch.setattr(Timepad, "_request_get_async", lambda self, *args, **kwargs: get())
+
+    events = asyncio.run(Timepad().get_events_async(tags=("id", "url")))
+
+    assert len(events) == 1
+    assert events[0].id == Timepad.parser_prefix + "1"
+
+
+def test_timepad_get_event_async(monkeypatch):
+    async def get(*args, **kwargs):
+        return Response(ok=True, json_items=timepad_response_event)
+
+    monkeypatch.setattr(Timepad, "_request_get_async", lambda self, *args, **kwargs: get())
+
+    event = asyncio.run(Timepad().get_event_async(event_id=12345, tags=("url",)))
+
+    assert event.url == "https://test.test"
+
+
 @pytest.fixture
 def requests_get_events_not_moderated(monkeypatch):
     timepad_response_event = dict(
@@ -123,13 +201,190 @@ def requests_get_events_not_moderated(monkeypatch):
     def get(*args, **kwargs):
         return Response(ok=True, json_items=dict(values=[timepad_response_event]))
 
-    monkeypatch.setattr(requests, "get", get)
+    monkeypatch.setattr(requests.Session, "get", get)
 
 
 def test_timepad_get_events_not_moderated(requests_get_events_not_moderated):
     assert len(Timepad().get_events()) == 1
 
 
+#######################################
+## timepad iter_events
+#######################################
+@pytest.mark.parametrize(
+    "total_events, limit, requests_count",
+    [(0, 2, 1), (3, 2, 2), (4, 2, 3), (5, None, 1)],
+    ids=["empty", "last_page_incomplete", "last_page_empty", "default_limit"],
+)
+def test_timepad_iter_events(monkeypatch, total_events, limit, requests_count):
+    requested_pages = list()
+
+    def get(*args, params, **kwargs):
+        requested_pages.append((params["skip"], params["limit"]))
+        values = [
+            dict(timepad_response_event, id=i)
+            for i in range(params["skip"], min(params["skip"] + params["limit"], total_events))
+        ]
+        return Response(ok=True, json_items=dict(values=values))
+
+    monkeypatch.setattr(requests.Session, "get", get)
+
+    request_params = dict() if limit is None else dict(limit=limit)
+    events = list(Timepad().iter_events(request_params=request_params, tags=("id",)))
+
+    assert [event.id for event in events] == [
+        Timepad.parser_prefix + str(i) for i in range(total_events)
+    ]
+    assert len(requested_pages) == requests_count
+    assert requested_pages[0] == (0, limit or Timepad.PAGE_SIZE)
+
+
+def test_timepad_request_params_unchanged(requests_get_created_events, tmp_path):
+    timepad = Timepad(state=tmp_path / "state.sqlite")
+    request_params = dict(sort="created_at", limit=2, skip=0)
+
+    list(timepad.iter_events(request_params=request_params, tags=("id",)))
+    timepad.get_events(request_params=request_params, tags=("id",))
+
+    assert request_params == dict(sort="created_at", limit=2, skip=0)
+
+
+#######################################
+## timepad state
+#######################################
+@pytest.fixture
+def requests_get_created_events(monkeypatch):
+    """
+    Events with created_at, paged by skip/limit,
+    requested parameters are in requests_get_created_events.params.
+    """
+    values = [
+        dict(timepad_response_event, id=i, created_at=f"2021-01-0{i}T00:00:00+0300")
+        for i in range(1, 6)
+    ]
+    params_list = list()
+
+    def get(*args, params, **kwargs):
+        params_list.append(dict(params))
+        skip = int(params.get("skip", 0))
+        page = values[skip : skip + int(params.get("limit", 10))]
+        return Response(ok=True, json_items=dict(values=page))
+
+    monkeypatch.setattr(requests.Session, "get", get)
+    get.values, get.params = values, params_list
+
+    return get
+
+
+def test_timepad_get_events_state(requests_get_created_events, tmp_path):
+    requested_params = requests_get_created_events.params
+    timepad = Timepad(state=tmp_path / "state.sqlite")
+
+    def get_events(**params):
+        params.setdefault("sort", "created_at")
+        return [
+            event.id for event in timepad.get_events(request_params=params, tags=("id",))
+        ]
+
+    assert get_events() == [f"TIMEPAD-{i}" for i in range(1, 6)]
+    assert "created_at_min" not in requested_params[-1]
+
+    # unchanged events are skipped
+    assert get_events() == []
+    assert requested_params[-1]["created_at_min"] == "2021-01-05T00:00:00+0300"
+
+    # changed event is parsed again
+    values = requests_get_created_events.values
+    values[0] = dict(values[0], name="changed")
+    assert get_events() == ["TIMEPAD-1"]
+
+    # explicit created_at_min is not replaced
+    get_events(created_at_min="2020")
+    assert requested_params[-1]["created_at_min"] == "2020"
+
+
+def test_timepad_get_events_state_parse_error(requests_get_created_events, tmp_path):
+    values = requests_get_created_events.values
+    values[1] = dict(values[1], location=dict(city="X"))
+    timepad = Timepad(state=tmp_path / "state.sqlite")
+
+    with pytest.raises(TypeError, match="Unknown address type"):
+        timepad.get_events(tags=("id", "adress"))
+
+    # caller didn't get events, so they are not recorded
+    events = timepad.get_events(tags=("id",))
+
+    assert [event.id for event in events] == [f"TIMEPAD-{i}" for i in range(1, 6)]
+
+
+def test_timepad_iter_events_state_parse_error(requests_get_created_events, tmp_path):
+    values = requests_get_created_events.values
+    values[1] = dict(values[1], location=dict(city="X"))
+    timepad = Timepad(state=tmp_path / "state.sqlite")
+
+    events = timepad.iter_events(tags=("id", "adress"))
+    assert next(events).id == "TIMEPAD-1"
+
+    with pytest.raises(TypeError, match="Unknown address type"):
+        next(events)
+
+    # only yielded event is recorded
+    events = timepad.iter_events(tags=("id",))
+
+    assert [event.id for event in events] == [f"TIMEPAD-{i}" for i in range(2, 6)]
+
+
+def test_timepad_created_at_mark_by_query(requests_get_created_events, tmp_path):
+    requested_params = requests_get_created_events.params
+    timepad = Timepad(state=tmp_path / "state.sqlite")
+
+    timepad.get_events(request_params=dict(cities="A", sort="created_at"))
+
+    timepad.get_events(request_params=dict(cities="B", sort="created_at"))
+    assert "created_at_min" not in requested_params[-1]
+
+    # normalized parameters: page parameters and spaces don't change mark
+    timepad.get_events(request_params=dict(cities=" A", sort="created_at", limit=20))
+    assert requested_params[-1]["created_at_min"] == "2021-01-05T00:00:00+0300"
+
+
+@pytest.mark.parametrize(
+    "request_params",
+    [dict(), dict(sort="starts_at"), dict(sort="created_at", limit=5)],
+    ids=["not sorted", "sorted by other field", "incomplete page"],
+)
+def test_timepad_created_at_mark_not_saved(
+    requests_get_created_events, tmp_path, request_params
+):
+    requested_params = requests_get_created_events.params
+    timepad = Timepad(state=tmp_path / "state.sqlite")
+
+    timepad.get_events(request_params=dict(request_params))
+    timepad.get_events(request_params=dict(request_params))
+
+    assert "created_at_min" not in requested_params[-1]
+
+
+def test_timepad_iter_events_created_at_mark(requests_get_created_events, tmp_path):
+    requested_params = requests_get_created_events.params
+    timepad = Timepad(state=tmp_path / "state.sqlite")
+
+    def iter_events():
+        request_params = dict(sort="created_at", limit=2)
+        return timepad.iter_events(request_params=request_params, tags=("id",))
+
+    # stopped iteration doesn't save mark
+    events = iter_events()
+    assert next(events).id == "TIMEPAD-1"
+    events.close()
+
+    assert len(list(iter_events())) == 4  # first event is known
+    assert "created_at_min" not in requested_params[-1]
+
+    list(iter_events())
+    assert requested_params[-1]["created_at_min"] == "2021-01-05T00:00:00+0300"
+
+
 #######################################
 ## timepad _adress
 #######################################
@@ -146,7 +401,7 @@ def requests_get_event_adress(monkeypatch):
     def get_subway(*args, **kwargs):
         return "test subway"
 
-    monkeypatch.setattr(requests, "get", get)
+    monkeypatch.setattr(requests.Session, "get", get)
     monkeypatch.setattr(find_metro.metro.get_subway_name, "get_subway", get_subway)
 
 
@@ -157,6 +412,31 @@ def test_timepad_adress(requests_get_event_adress):
     assert event.adress == "test_address, м.test subway"
 
 
+def test_timepad_adress_subway_cache(monkeypatch):
+    subway_calls = list()
+
+    def get(*args, **kwargs):
+        return Response(ok=True, json_items=dict(values=[event, event]))
+
+    def get_subway(self, address):
+        subway_calls.append(address)
+        return "test subway"
+
+    event = dict(
+        moderation_status="moderated",
+        location=dict(city="test", address="test_address"),
+    )
+    monkeypatch.setattr(requests.Session, "get", get)
+    monkeypatch.setattr(find_metro.metro.get_subway_name, "get_subway", get_subway)
+
+    timepad = Timepad()
+    events = timepad.get_events(tags=("adress",))
+
+    assert [event.adress for event in events] == ["test_address, м.test subway"] * 2
+    assert subway_calls == ["test_address"]
+    assert timepad.subway_cache.stats["hits"] == 1
+
+
 @pytest.fixture
 def requests_get_event_adress_city1(monkeypatch):
     timepad_response_event = dict(
@@ -167,7 +447,7 @@ def requests_get_event_adress_city1(monkeypatch):
     def get(*args, **kwargs):
         return Response(ok=True, json_items=timepad_response_event)
 
-    monkeypatch.setattr(requests, "get", get)
+    monkeypatch.setattr(requests.Session, "get", get)
 
 
 def test_timepad_adress_city1(requests_get_event_adress_city1):
@@ -187,7 +467,7 @@ def requests_get_event_adress_city2(monkeypatch):
     def get(*args, **kwargs):
         return Response(ok=True, json_items=timepad_response_event)
 
-    monkeypatch.setattr(requests, "get", get)
+    monkeypatch.setattr(requests.Session, "get", get)
 
 
 def test_timepad_adress_city2(requests_get_event_adress_city2):
@@ -207,7 +487,7 @@ def requests_get_event_adress_city3(monkeypatch):
     def get(*args, **kwargs):
         return Response(ok=True, json_items=timepad_response_event)
 
-    monkeypatch.setattr(requests, "get", get)
+    monkeypatch.setattr(requests.Session, "get", get)
 
 
 def test_timepad_adress_city3(requests_get_event_adress_city3):
@@ -227,7 +507,7 @@ def requests_get_event_adress_city4(monkeypatch):
     def get(*args, **kwargs):
         return Response(ok=True, json_items=timepad_response_event)
 
-    monkeypatch.setattr(requests, "get", get)
+    monkeypatch.setattr(requests.Session, "get", get)
 
 
 def test_timepad_adress_city4(requests_get_event_adress_city4):
@@ -250,7 +530,7 @@ def requests_get_event_date_to(monkeypatch):
     def get(*args, **kwargs):
         return Response(ok=True, json_items=timepad_response_event)
 
-    monkeypatch.setattr(requests, "get", get)
+    monkeypatch.setattr(requests.Session, "get", get)
 
 
 def test_timepad_date_to(requests_get_event_date_to):
@@ -283,7 +563,7 @@ def test_timepad_post_text(monkeypatch, description):
     def get(*args, **kwargs):
         return Response(ok=True, json_items=timepad_response_event)
 
-    monkeypatch.setattr(requests, "get", get)
+    monkeypatch.setattr(requests.Session, "get", get)
 
     tags = ("post_text",)
     event = Timepad().get_event(event_id=12345, tags=tags)
@@ -304,7 +584,7 @@ def requests_get_event_poster_imag(monkeypatch):
     def get(*args, **kwargs):
         return Response(ok=True, json_items=timepad_response_event)
 
-    monkeypatch.setattr(requests, "get", get)
+    monkeypatch.setattr(requests.Session, "get", get)
 
 
 def test_timepad_poster_imag(requests_get_event_poster_imag):
@@ -350,13 +630,67 @@ def test_timepad_price(monkeypatch, ticket_type, answ, is_registration_open):
     def get(*args, **kwargs):
         return Response(ok=True, json_items=timepad_response_event)
 
-    monkeypatch.setattr(requests, "get", get)
+    monkeypatch.setattr(requests.Session, "get", get)
     tags = ("price",)
     event = Timepad().get_event(event_id=12345, tags=tags)
 
     assert event.price == answ
 
 
+#######################################
+## timepad dictionaries
+#######################################
+@pytest.fixture
+def requests_get_dictionary(monkeypatch):
+    requested_urls = list()
+
+    def get(session, url, **kwargs):
+        requested_urls.append(url)
+        return Response(ok=True, json_items=dict(values=[dict(id="1", name="test")]))
+
+    Timepad.invalidate_dictionaries()
+    monkeypatch.setattr(requests.Session, "get", get)
+    yield requested_urls
+    Timepad.invalidate_dictionaries()
+
+
+def test_timepad_dictionary_shared(requests_get_dictionary):
+    assert Timepad().event_categories == [dict(id="1", name="test")]
+    assert Timepad().event_categories == [dict(id="1", name="test")]
+    assert Timepad().event_statuses == [dict(id="1", name="test")]
+
+    assert requests_get_dictionary == [
+        Timepad.DICTIONARY_API + "event_categories",
+        Timepad.DICTIONARY_API + "event_statuses",
+    ]
+
+
+def test_timepad_dictionary_ttl(requests_get_dictionary):
+    Timepad().event_categories
+    Timepad(dictionary_ttl=0).event_categories
+
+    assert len(requests_get_dictionary) == 2
+
+
+def test_timepad_dictionary_invalidate(requests_get_dictionary):
+    Timepad().event_categories
+    Timepad().tickets_statuses
+    Timepad.invalidate_dictionaries("event_categories")
+    Timepad().event_categories
+    Timepad().tickets_statuses
+
+    assert len(requests_get_dictionary) == 3
+
+
+def test_timepad_dictionary_snapshot(requests_get_dictionary, tmp_path):
+    Timepad().save_dictionaries(tmp_path / "dictionaries.json")
+    Timepad.invalidate_dictionaries()
+    Timepad.load_dictionaries(tmp_path / "dictionaries.json")
+
+    assert Timepad(dictionary_ttl=0).tickets_statuses == [dict(id="1", name="test")]
+    assert len(requests_get_dictionary) == len(Timepad.DICTIONARIES)
+
+
 #######################################
 ## timepad event_categories
 #######################################
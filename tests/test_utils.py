@@ -0,0 +1,115 @@
+import pytest
+from bs4 import BeautifulSoup
+
+from escraper.parsers.utils import strip_html_tags, truncate_text
+
+
+def prepare_post_text_split(post_text):
+    """
+    Previous BaseParser.prepare_post_text implementation.
+    """
+    if len(post_text) > 550:
+        sentences = post_text.split(".")
+        post = ""
+        for s in sentences:
+            if len(post) < 365:
+                post = post + s + "."
+            else:
+                post_text = post
+                break
+
+    return post_text
+
+
+#######################################
+## utils strip_html_tags
+#######################################
+@pytest.mark.parametrize(
+    "data",
+    [
+        "plain text",
+        "<p>Hello<br>world<br/>!</p>",
+        "<p>a</p>\n<p>b</p>",
+        "<!-- comment -->text<!DOCTYPE html>",
+        "<a href=\"x>y\" title='a>b'>link</a> tail",
+        "a < b and c > d",
+        "<3 love",
+        "Тест <b>жирный</b> &laquo;кавычки&raquo;",
+        "a &amp; b &lt;tag&gt; &nbsp;x &quot;q&quot; &#1055;&#x41f;",
+        "&copy x &unknown; &nbsp",
+        "<!-- unclosed comment",
+        "</ p>bogus end tag",
+        "<?xml version='1.0'?>x",
+        "<div\nclass='a'>multi\nline</div>",
+        "<script>var a = 1 < 2;</script>text",
+        "a<style>p {color: red}</style>b",
+        "<SCRIPT type='x'>if (a<b) {}</SCRIPT>after",
+        "<script>a</script >b",
+        "<script>never closed",
+        "a<script/>b",
+        "<template>t</template>x",
+        "<p>a &amp</p>",
+        "<p>a &amp<b>x</b></p>",
+        "a &amp<!-- c -->",
+        "x<![CDATA[ cdata <b> &amp; ]]>y",
+        "<p>Hello</p>\n\n<p>World</p>",
+        "<p>A</p>\r\n  <p>B</p>",
+        "<b>x</b>   <i>y</i>",
+        "  \n<p>x</p>  ",
+        "   ",
+        "<p>a</p>&#32;&#10;<p>b</p>",
+        "<p>a</p><!-- c -->  \t<p>b</p>",
+        "a<![CDATA[ \n ]]>b",
+        "<pre>\n\n <b> </b>\n</pre> \n <p>x</p>",
+        "<textarea>  </textarea>  <p>x</p>",
+        "<PRE >  </PRE><pre/>  <b>x</b>",
+        "<b><pre>  </b>  <i>x</i>",
+    ],
+)
+def test_strip_html_tags(data):
+    assert strip_html_tags(data) == BeautifulSoup(data, "html.parser").get_text()
+
+
+def test_strip_html_tags_plain_text_unchanged():
+    data = "Большой зал филармонии, Михайловская ул., 2"
+    assert strip_html_tags(data) is data
+
+
+#######################################
+## utils truncate_text
+#######################################
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Короткий текст. Без обрезки.",
+        "а" * 600,
+        "а" * 600 + ".",
+        "Предложение. " * 50,
+        "Предложение. " * 50 + "Конец без точки",
+        "а" * 363 + ". " + "б" * 300,
+        "а" * 364 + ". " + "б" * 300,
+        "а" * 365 + ". " + "б" * 300,
+        "а" * 400 + ". " + "б" * 300 + ".",
+        "а" * 364 + "... " + "б" * 300,
+        "а" * 551,
+        "а" * 550 + ".",
+    ],
+)
+def test_truncate_text_same_as_split(text):
+    assert truncate_text(text) == prepare_post_text_split(text)
+
+
+@pytest.mark.parametrize(
+    "terminator",
+    ["!", "?", "…"],
+)
+def test_truncate_text_terminators(terminator):
+    text = "а" * 400 + terminator + " " + "б" * 300 + "."
+
+    assert truncate_text(text) == "а" * 400 + terminator
+
+
+def test_truncate_text_first_terminator():
+    text = "а" * 400 + "?! " + "б" * 300 + "."
+
+    assert truncate_text(text) == "а" * 400 + "?"